@@ -0,0 +1,149 @@
+"""
+Prefix-trie index over fixed-line area codes, mobile prefixes and telemarketer prefixes.
+
+`CodeIndex.classify` walks a number one character at a time, so every caller and
+receiver is classified in O(length of the number). Area codes and mobile prefixes
+that are not registered yet are learned the first time they are seen, following
+the TASK 3 rules:
+ - fixed lines start with an area code in brackets, e.g. (080);
+ - mobile numbers start with 7, 8 or 9 and their prefix is the first four digits;
+ - telemarketers start with 140.
+
+`CodeMatrix` uses the index to build, in one pass, the caller-code x receiver-code
+matrix for every city at once, together with the share of calls that stay in the
+caller's city.
+
+Usage:
+    python area_codes.py [--texts texts.csv] [--calls calls.csv]
+"""
+import argparse
+from collections import Counter
+
+from stream_engine import Aggregator, run
+
+FIXED = "fixed"
+MOBILE = "mobile"
+TELEMARKETER = "telemarketer"
+MOBILE_PREFIX_LENGTH = 4
+
+
+class TrieNode(object):
+    __slots__ = ("children", "code", "kind")
+
+    def __init__(self):
+        self.children = {}
+        self.code = None
+        self.kind = None
+
+
+class CodeIndex(object):
+
+    def __init__(self, fixed_codes=(), mobile_prefixes=(), telemarketer_prefixes=("140",)):
+        self.root = TrieNode()
+        for codes, kind in ((fixed_codes, FIXED), (mobile_prefixes, MOBILE), (telemarketer_prefixes, TELEMARKETER)):
+            for code in codes:
+                self.add(code, kind)
+
+    def add(self, code, kind):
+        node = self.root
+        for character in code:
+            child = node.children.get(character)
+            if child is None:
+                child = node.children[character] = TrieNode()
+            node = child
+        node.code = code
+        node.kind = kind
+
+    def classify(self, number):
+        """
+        Returns (code, kind) of a number, or (None, None) if it has no recognizable code.
+        """
+        node = self.root
+        for character in number:
+            node = node.children.get(character)
+            if node is None:
+                break
+            if node.code is not None:
+                return node.code, node.kind
+        return self._learn(number)
+
+    def _learn(self, number):
+        if not number:
+            return None, None
+        if number[0] == '(':
+            end = number.find(')')
+            if end > 0:
+                code = number[:end + 1]
+                self.add(code, FIXED)
+                return code, FIXED
+        elif number[0] in "789" and len(number) >= MOBILE_PREFIX_LENGTH:
+            code = number[:MOBILE_PREFIX_LENGTH]
+            self.add(code, MOBILE)
+            return code, MOBILE
+        return None, None
+
+    def codes(self, kind=None):
+        """Returns the registered codes, optionally only those of one kind."""
+        codes = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node.code is not None and (kind is None or node.kind == kind):
+                codes.append(node.code)
+            stack.extend(node.children.values())
+        return sorted(codes)
+
+
+class CodeMatrix(Aggregator):
+    """TASK 3 for every city at once: caller-code x receiver-code call counts."""
+
+    def __init__(self, index=None):
+        self.index = index or CodeIndex()
+        self.matrix = Counter()
+
+    def add_call(self, call):
+        caller_code, _ = self.index.classify(call[0])
+        receiver_code, _ = self.index.classify(call[1])
+        self.matrix[caller_code, receiver_code] += 1
+
+    def merge(self, other):
+        self.matrix.update(other.matrix)
+        for code in other.index.codes(FIXED):
+            self.index.add(code, FIXED)
+        for code in other.index.codes(MOBILE):
+            self.index.add(code, MOBILE)
+
+    def called_codes(self, caller_code):
+        """Codes called from numbers with the given code, in lexicographic order."""
+        return sorted(receiver for (caller, receiver) in self.matrix if caller == caller_code and receiver)
+
+    def same_city_percentages(self):
+        """Maps every fixed-line area code to the percentage of its calls made to the same area code."""
+        totals = Counter()
+        for (caller, _), count in self.matrix.items():
+            totals[caller] += count
+        return {code: round(self.matrix[code, code] / totals[code] * 100, 2)
+                for code in self.index.codes(FIXED) if totals[code]}
+
+    def report(self):
+        lines = []
+        for code, percentage in sorted(self.same_city_percentages().items()):
+            lines.append(f"The numbers called by people in {code} have codes: {' '.join(self.called_codes(code))}")
+            lines.append(f"{percentage} percent of calls from fixed lines in {code} are calls to other fixed lines "
+                         f"in {code}.")
+        return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Caller-code x receiver-code breakdown for every city.")
+    parser.add_argument("--texts", default="texts.csv")
+    parser.add_argument("--calls", default="calls.csv")
+    args = parser.parse_args()
+
+    for aggregator in run([CodeMatrix()], args.texts, args.calls):
+        for line in aggregator.report():
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Benchmark harness for the P0 tasks.
+
+Every task is run in every execution mode as a separate process over the same
+texts.csv and calls.csv, and the wall time, peak RSS and rows per second of each
+run are reported, so performance regressions show up as numbers. Data can be
+generated on the fly with generate_data.py.
+
+Usage:
+    python benchmark.py --data-dir <dir> [--generate-calls N --generate-texts N]
+                        [--modes tasks stream parallel ...] [--tasks 0 1 2 3 4] [--output results.csv]
+"""
+import argparse
+import csv
+import os
+import subprocess
+import sys
+import time
+
+from generate_data import generate
+from stream_engine import add_task_arguments
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def script(name):
+    return [sys.executable, os.path.join(HERE, name)]
+
+
+def task_script_command(task, data_dir, store_dir, workers):
+    # The original TaskN.py scripts read texts.csv and calls.csv from the working directory.
+    return script(f"Task{task}.py")
+
+
+def stream_command(task, data_dir, store_dir, workers):
+    return script("stream_engine.py") + ["--tasks", str(task)]
+
+
+def approximate_command(task, data_dir, store_dir, workers):
+    return stream_command(task, data_dir, store_dir, workers) + ["--approximate-precision", "14"]
+
+
+def parallel_command(task, data_dir, store_dir, workers):
+    return script("parallel_engine.py") + ["--tasks", str(task), "--workers", str(workers)]
+
+
+def columnar_command(task, data_dir, store_dir, workers):
+    if task == 0:
+        return None
+    return script("columnar_store.py") + ["report", store_dir, "--tasks", str(task)]
+
+
+def vectorized_command(task, data_dir, store_dir, workers):
+    if task != 2:
+        return None
+    return script("task2_vectorized.py")
+
+
+def incremental_command(task, data_dir, store_dir, workers):
+    if task != 4:
+        return None
+    state = os.path.join(store_dir, "benchmark_state.json")
+    if os.path.exists(state):
+        os.remove(state)
+    return script("telemarketers.py") + [state]
+
+
+def bloom_command(task, data_dir, store_dir, workers):
+    command = incremental_command(task, data_dir, store_dir, workers)
+    return command and command + ["--false-positive-rate", "0.01", "--expected-numbers", "1000000"]
+
+
+MODES = {
+    "tasks": task_script_command,
+    "stream": stream_command,
+    "approximate": approximate_command,
+    "parallel": parallel_command,
+    "columnar": columnar_command,
+    "vectorized": vectorized_command,
+    "incremental": incremental_command,
+    "bloom": bloom_command,
+}
+
+
+def measure(command, cwd):
+    """
+    Runs a command to completion.
+
+    Returns:
+       (wall time in seconds, peak RSS in MB) of the process.
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen(command, cwd=cwd, stdout=subprocess.DEVNULL)
+    _, status, usage = os.wait4(process.pid, 0)
+    wall = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, command)
+    peak_rss = usage.ru_maxrss / 1024 if sys.platform != "darwin" else usage.ru_maxrss / (1024 * 1024)
+    return wall, peak_rss
+
+
+def count_rows(path):
+    with open(path, 'rb') as f:
+        return sum(1 for line in f if line.strip())
+
+
+def run_benchmarks(data_dir, modes, tasks, workers, repeat=1):
+    """
+    Yields one result dict per (mode, task), with the best wall time over `repeat` runs.
+    """
+    data_dir = os.path.abspath(data_dir)
+    rows = count_rows(os.path.join(data_dir, "texts.csv")) + count_rows(os.path.join(data_dir, "calls.csv"))
+    store_dir = os.path.join(data_dir, "columnar")
+    if "columnar" in modes:
+        wall, peak_rss = measure(script("columnar_store.py") + ["convert", store_dir], data_dir)
+        yield {"mode": "columnar", "task": "convert", "rows": rows, "wall_s": wall, "peak_rss_mb": peak_rss,
+               "rows_per_s": rows / wall}
+    os.makedirs(store_dir, exist_ok=True)
+
+    for mode in modes:
+        for task in tasks:
+            best = None
+            for _ in range(repeat):
+                command = MODES[mode](task, data_dir, store_dir, workers)
+                if command is None:
+                    break
+                result = measure(command, data_dir)
+                best = result if best is None or result[0] < best[0] else best
+            if best is not None:
+                wall, peak_rss = best
+                yield {"mode": mode, "task": task, "rows": rows, "wall_s": wall, "peak_rss_mb": peak_rss,
+                       "rows_per_s": rows / wall}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the P0 tasks in every execution mode.")
+    parser.add_argument("--data-dir", default=HERE, help="directory holding texts.csv and calls.csv")
+    parser.add_argument("--generate-calls", type=int, default=None, help="generate this many calls first")
+    parser.add_argument("--generate-texts", type=int, default=None, help="generate this many texts first")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=list(MODES))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=1, help="runs per measurement, the best one is kept")
+    parser.add_argument("--output", default=None, help="also write the results to this csv file")
+    add_task_arguments(parser)
+    args = parser.parse_args()
+
+    if args.generate_calls or args.generate_texts:
+        generate(args.data_dir, calls=args.generate_calls or 0, texts=args.generate_texts or 0, seed=args.seed)
+
+    fields = ["mode", "task", "rows", "wall_s", "peak_rss_mb", "rows_per_s"]
+    results = []
+    print(f"{'mode':<12}{'task':>8}{'rows':>14}{'wall (s)':>12}{'peak RSS (MB)':>16}{'rows/s':>14}")
+    for result in run_benchmarks(args.data_dir, args.modes, sorted(args.tasks), args.workers, args.repeat):
+        results.append(result)
+        print(f"{result['mode']:<12}{result['task']:>8}{result['rows']:>14}{result['wall_s']:>12.3f}"
+              f"{result['peak_rss_mb']:>16.1f}{result['rows_per_s']:>14.0f}")
+
+    if args.output:
+        with open(args.output, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(results)
+
+
+if __name__ == "__main__":
+    main()
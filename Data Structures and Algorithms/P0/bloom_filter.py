@@ -0,0 +1,76 @@
+"""
+Bloom filter for approximate set membership of telephone numbers.
+
+The filter is sized from the expected number of items and the wanted false-positive
+rate: it never reports a number it has seen as missing, and reports an unseen number
+as present with about the configured probability, using roughly 1.2 bytes per item
+at a 1% rate instead of the 60+ bytes of a Python string in a set.
+"""
+import hashlib
+import math
+
+MAGIC = b"BLM1"
+HEADER_SIZE = len(MAGIC) + 8 + 1 + 8 + 8
+
+
+class BloomFilter(object):
+
+    def __init__(self, capacity, false_positive_rate=0.01):
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive.")
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("False-positive rate must be between 0 and 1.")
+        self.capacity = capacity
+        self.false_positive_rate = false_positive_rate
+        self.size = max(8, int(math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2)))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, value):
+        if isinstance(value, str):
+            value = value.encode()
+        digest = hashlib.blake2b(value, digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'big'), int.from_bytes(digest[8:], 'big') | 1
+        return [(first + index * second) % self.size for index in range(self.hash_count)]
+
+    def add(self, value):
+        bits = self.bits
+        for position in self._positions(value):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value):
+        bits = self.bits
+        for position in self._positions(value):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def merge(self, other):
+        if (other.size, other.hash_count) != (self.size, self.hash_count):
+            raise ValueError("Cannot merge Bloom filters with different parameters.")
+        self.bits = bytearray(a | b for a, b in zip(self.bits, other.bits))
+        self.count += other.count
+
+    def to_bytes(self):
+        header = (MAGIC + self.capacity.to_bytes(8, 'big') + self.hash_count.to_bytes(1, 'big')
+                  + self.size.to_bytes(8, 'big') + self.count.to_bytes(8, 'big'))
+        return header + bytes(self.bits)
+
+    @classmethod
+    def from_bytes(cls, data, false_positive_rate):
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError("Not a Bloom filter.")
+        bloom_filter = cls(int.from_bytes(data[4:12], 'big'), false_positive_rate)
+        bloom_filter.hash_count = data[12]
+        bloom_filter.size = int.from_bytes(data[13:21], 'big')
+        bloom_filter.count = int.from_bytes(data[21:29], 'big')
+        bloom_filter.bits = bytearray(data[HEADER_SIZE:])
+        if len(bloom_filter.bits) != (bloom_filter.size + 7) // 8:
+            raise ValueError("Truncated Bloom filter.")
+        return bloom_filter
+
+    def __repr__(self):
+        return (f"BloomFilter(capacity={self.capacity}, false_positive_rate={self.false_positive_rate}, "
+                f"bits={self.size}, hashes={self.hash_count})")
@@ -0,0 +1,209 @@
+"""
+Columnar, memory-mapped binary store for calls.csv and texts.csv.
+
+The converter streams both logs once and writes one flat binary file per column:
+telephone numbers are dictionary-encoded to int32 ids (the dictionary is shared
+by both logs), timestamps are stored as int64 epoch seconds and durations as
+uint32. The loader memory-maps those columns, so Task1-Task4 run on NumPy arrays
+without parsing any text.
+
+Usage:
+    python columnar_store.py convert <store_dir> [--texts texts.csv] [--calls calls.csv]
+    python columnar_store.py report <store_dir>
+"""
+import argparse
+import os
+
+import numpy as np
+
+from stream_engine import TimestampParser, add_task_arguments, read_records
+from task2_vectorized import longest_time_report
+
+NUMBERS_FILE = "numbers.txt"
+COLUMNS = {
+    "calls": (("caller", "<i4"), ("receiver", "<i4"), ("timestamp", "<i8"), ("duration", "<u4")),
+    "texts": (("sender", "<i4"), ("receiver", "<i4"), ("timestamp", "<i8")),
+}
+CHUNK_SIZE = 1 << 16
+
+
+def column_path(directory, table, column):
+    return os.path.join(directory, f"{table}.{column}.bin")
+
+
+class ColumnWriter(object):
+    """Buffers the values of one column and flushes them to disk in chunks."""
+
+    def __init__(self, path, dtype):
+        self.file = open(path, 'wb')
+        self.dtype = dtype
+        self.buffer = []
+
+    def append(self, value):
+        self.buffer.append(value)
+        if len(self.buffer) >= CHUNK_SIZE:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            np.asarray(self.buffer, dtype=self.dtype).tofile(self.file)
+            self.buffer = []
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+
+def convert(directory, texts_path='texts.csv', calls_path='calls.csv'):
+    """
+    One-time conversion of the csv logs into a columnar store.
+
+    Args:
+      directory(str): output directory of the store.
+      texts_path(str): path of the texts csv file.
+      calls_path(str): path of the calls csv file.
+
+    Returns:
+       the number of distinct telephone numbers written to the dictionary.
+    """
+    os.makedirs(directory, exist_ok=True)
+    number_ids = {}
+    parse_timestamp = TimestampParser()
+
+    def encode(number):
+        number_id = number_ids.get(number)
+        if number_id is None:
+            number_id = len(number_ids)
+            number_ids[number] = number_id
+        return number_id
+
+    for table, path in (("texts", texts_path), ("calls", calls_path)):
+        writers = [ColumnWriter(column_path(directory, table, column), dtype) for column, dtype in COLUMNS[table]]
+        try:
+            for record in read_records(path):
+                writers[0].append(encode(record[0]))
+                writers[1].append(encode(record[1]))
+                writers[2].append(parse_timestamp(record[2]))
+                if table == "calls":
+                    writers[3].append(int(record[3]))
+        finally:
+            for writer in writers:
+                writer.close()
+
+    with open(os.path.join(directory, NUMBERS_FILE), 'w') as f:
+        for number in number_ids:
+            f.write(number + "\n")
+    return len(number_ids)
+
+
+def map_column(path, dtype):
+    if os.path.getsize(path) == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r')
+
+
+class ColumnarStore(object):
+    """
+    Memory-mapped view over a store written by `convert`.
+    Columns are exposed as attributes named <table>_<column>, e.g. calls_caller.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        for table, columns in COLUMNS.items():
+            for column, dtype in columns:
+                setattr(self, f"{table}_{column}", map_column(column_path(directory, table, column), dtype))
+        self._numbers = None
+
+    @property
+    def numbers(self):
+        """Dictionary of telephone numbers, indexed by id. Loaded on first use."""
+        if self._numbers is None:
+            with open(os.path.join(self.directory, NUMBERS_FILE), 'r') as f:
+                self._numbers = f.read().splitlines()
+        return self._numbers
+
+    @property
+    def number_count(self):
+        return len(self.numbers)
+
+
+def task1(store):
+    seen = np.zeros(store.number_count, dtype=bool)
+    for column in (store.texts_sender, store.texts_receiver, store.calls_caller, store.calls_receiver):
+        seen[column] = True
+    return [f"There are {np.count_nonzero(seen)} different telephone numbers in the records."]
+
+
+def task2(store, k=1):
+    return longest_time_report(store.numbers, store.calls_caller, store.calls_receiver,
+                               store.calls_duration, store.calls_timestamp, k)
+
+
+def number_code(number):
+    """Returns the area code or mobile prefix of a number, or None if it has neither."""
+    if number[0] == '(':
+        return number[:number.index(')') + 1]
+    if number[0] in "789":
+        return number[:4]
+    if number[:3] == "140":
+        return "140"
+    return None
+
+
+def task3(store):
+    numbers = store.numbers
+    codes = sorted({code for code in map(number_code, numbers) if code is not None})
+    code_ids = {code: index for index, code in enumerate(codes)}
+    number_codes = np.array([code_ids.get(number_code(number), -1) for number in numbers], dtype=np.int32)
+    is_bangalore = np.array([number.startswith("(080)") for number in numbers], dtype=bool)
+
+    from_bangalore = is_bangalore[store.calls_caller]
+    received = store.calls_receiver[from_bangalore]
+    called_codes = np.unique(number_codes[received])
+
+    lines = ["The numbers called by people in Bangalore have codes:"]
+    lines.extend(codes[code_id] for code_id in called_codes if code_id >= 0)
+    percentage = round(float(is_bangalore[received].mean()) * 100, 2) if received.size else 0
+    lines.append(f"{percentage} percent of calls from fixed lines in Bangalore are"
+                 f" calls to other fixed lines in Bangalore.")
+    return lines
+
+
+def task4(store):
+    excluded = np.zeros(store.number_count, dtype=bool)
+    for column in (store.calls_receiver, store.texts_sender, store.texts_receiver):
+        excluded[column] = True
+    callers = np.unique(store.calls_caller)
+    numbers = store.numbers
+    marketers = sorted(numbers[number_id] for number_id in callers[~excluded[callers]])
+    return ["These numbers could be telemarketers: "] + marketers
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Columnar store for the P0 call and text logs.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    convert_parser = subparsers.add_parser("convert", help="convert the csv logs into a columnar store")
+    convert_parser.add_argument("store")
+    convert_parser.add_argument("--texts", default="texts.csv")
+    convert_parser.add_argument("--calls", default="calls.csv")
+    report_parser = subparsers.add_parser("report", help="print Task1-Task4 from a columnar store")
+    report_parser.add_argument("store")
+    add_task_arguments(report_parser)
+    args = parser.parse_args()
+
+    if args.command == "convert":
+        count = convert(args.store, args.texts, args.calls)
+        print(f"Wrote {count} telephone numbers to {args.store}")
+        return
+
+    store = ColumnarStore(args.store)
+    tasks = {1: task1, 2: task2, 3: task3, 4: task4}
+    for task in sorted(args.tasks):
+        if task in tasks:
+            for line in tasks[task](store):
+                print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Synthetic call and text log generator for benchmarking the P0 tasks.
+
+Writes texts.csv and calls.csv in the same format as the bundled files, at any
+scale: fixed lines "(0xx)xxxxxxxx", mobiles "7xxxx xxxxx" (first digit 7, 8 or 9)
+and telemarketers "140xxxxxxx", which only ever make outgoing calls. Records are
+written in time order over the requested period, and a few numbers are much
+busier than the rest, as in real traffic. Rows are streamed to disk, so memory
+only depends on the size of the number pool.
+
+Usage:
+    python generate_data.py <out_dir> --calls 1000000 --texts 2000000 [--numbers N] [--seed S]
+"""
+import argparse
+import calendar
+import os
+import random
+import time
+
+AREA_CODES = ["(080)", "(022)", "(044)", "(040)", "(011)", "(033)", "(0471)", "(0821)", "(04344)", "(04546)"]
+FIXED_SHARE = 0.35
+TELEMARKETER_SHARE = 0.02
+MAX_DURATION = 5000
+WRITE_BATCH = 10000
+
+
+def make_number(rng, kind):
+    if kind == "fixed":
+        code = rng.choice(AREA_CODES)
+        return code + str(rng.randint(2, 9)) + "".join(str(rng.randint(0, 9)) for _ in range(12 - len(code)))
+    if kind == "mobile":
+        digits = str(rng.randint(7, 9)) + "".join(str(rng.randint(0, 9)) for _ in range(9))
+        return digits[:5] + " " + digits[5:]
+    return "140" + "".join(str(rng.randint(0, 9)) for _ in range(7))
+
+
+def make_pool(rng, size, kinds):
+    """Returns `size` distinct numbers, drawn according to the (kind, weight) pairs."""
+    pool = set()
+    names = [kind for kind, _ in kinds]
+    weights = [weight for _, weight in kinds]
+    while len(pool) < size:
+        pool.add(make_number(rng, rng.choices(names, weights)[0]))
+    return sorted(pool)
+
+
+def pick(rng, pool):
+    """Skewed pick: low indexes are chosen far more often than high ones."""
+    return pool[int(len(pool) * rng.random() ** 3)]
+
+
+def write_log(path, rows, start, period, make_row):
+    with open(path, 'w') as f:
+        batch = []
+        for index in range(rows):
+            timestamp = time.strftime("%d-%m-%Y %H:%M:%S", time.gmtime(start + period * index // max(rows, 1)))
+            batch.append(make_row(timestamp))
+            if len(batch) >= WRITE_BATCH:
+                f.write("\n".join(batch) + "\n")
+                batch = []
+        if batch:
+            f.write("\n".join(batch) + "\n")
+
+
+def generate(out_dir, calls=5213, texts=9072, numbers=None, seed=0, start="01-09-2016", days=30):
+    """
+    Writes texts.csv and calls.csv into out_dir.
+
+    Args:
+      out_dir(str): output directory.
+      calls(int): number of call records.
+      texts(int): number of text records.
+      numbers(int): size of the subscriber pool, defaults to about one number per 20 records.
+      seed(int): random seed, the same seed gives the same files.
+      start(str): first day of the period, as dd-mm-YYYY.
+      days(int): length of the period in days.
+    """
+    rng = random.Random(seed)
+    numbers = numbers or max(100, (calls + texts) // 20)
+    subscribers = make_pool(rng, numbers, [("fixed", FIXED_SHARE), ("mobile", 1 - FIXED_SHARE)])
+    mobiles = [number for number in subscribers if number[0] != "("]
+    telemarketers = make_pool(rng, max(1, int(numbers * TELEMARKETER_SHARE)), [("telemarketer", 1)])
+    rng.shuffle(subscribers)
+    rng.shuffle(mobiles)
+    start_epoch = calendar.timegm(time.strptime(start, "%d-%m-%Y"))
+    period = days * 86400
+
+    def text_row(timestamp):
+        return f"{pick(rng, mobiles)},{pick(rng, mobiles)},{timestamp}"
+
+    def call_row(timestamp):
+        caller = pick(rng, telemarketers) if rng.random() < TELEMARKETER_SHARE * 5 else pick(rng, subscribers)
+        return f"{caller},{pick(rng, subscribers)},{timestamp},{int(rng.expovariate(1 / 600)) % MAX_DURATION}"
+
+    os.makedirs(out_dir, exist_ok=True)
+    write_log(os.path.join(out_dir, "texts.csv"), texts, start_epoch, period, text_row)
+    write_log(os.path.join(out_dir, "calls.csv"), calls, start_epoch, period, call_row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic call and text logs.")
+    parser.add_argument("out_dir")
+    parser.add_argument("--calls", type=int, default=5213, help="number of call records")
+    parser.add_argument("--texts", type=int, default=9072, help="number of text records")
+    parser.add_argument("--numbers", type=int, default=None, help="size of the subscriber pool")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--start", default="01-09-2016", help="first day, as dd-mm-YYYY")
+    parser.add_argument("--days", type=int, default=30)
+    args = parser.parse_args()
+
+    generate(args.out_dir, args.calls, args.texts, args.numbers, args.seed, args.start, args.days)
+
+
+if __name__ == "__main__":
+    main()
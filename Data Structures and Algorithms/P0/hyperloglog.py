@@ -0,0 +1,128 @@
+"""
+HyperLogLog sketch for approximate distinct counting of telephone numbers.
+
+A sketch with precision p keeps 2^p one-byte registers, whatever the number of
+distinct values, and has a relative standard error of about 1.04 / sqrt(2^p).
+Sketches built over different days or shards merge by taking the register-wise
+maximum, and serialize to a few kilobytes so daily sketches can be rolled up
+into monthly counts without reprocessing the raw logs.
+
+Usage:
+    python hyperloglog.py count <sketch> [<sketch> ...]
+    python hyperloglog.py merge <output> <sketch> [<sketch> ...]
+"""
+import argparse
+import hashlib
+import math
+
+MAGIC = b"HLL1"
+MIN_PRECISION = 4
+MAX_PRECISION = 18
+HASH_BITS = 64
+
+
+def hash_value(value):
+    """64-bit hash of a string or bytes value."""
+    if isinstance(value, str):
+        value = value.encode()
+    return int.from_bytes(hashlib.blake2b(value, digest_size=8).digest(), 'big')
+
+
+class HyperLogLog(object):
+
+    def __init__(self, precision=14):
+        if not MIN_PRECISION <= precision <= MAX_PRECISION:
+            raise ValueError(f"Precision must be between {MIN_PRECISION} and {MAX_PRECISION}.")
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(self.size)
+        self._rank_bits = HASH_BITS - precision
+        self._rank_mask = (1 << self._rank_bits) - 1
+
+    def add(self, value):
+        hashed = hash_value(value)
+        index = hashed >> self._rank_bits
+        rank = self._rank_bits - (hashed & self._rank_mask).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other):
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches with different precisions.")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def count(self):
+        """Returns the estimated number of distinct values added."""
+        if self.size >= 128:
+            alpha = 0.7213 / (1 + 1.079 / self.size)
+        else:
+            alpha = {16: 0.673, 32: 0.697, 64: 0.709}[self.size]
+        estimate = alpha * self.size * self.size / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.size and zeros:
+            # Small range correction: linear counting is more accurate for sparse sketches.
+            estimate = self.size * math.log(self.size / zeros)
+        return int(round(estimate))
+
+    @property
+    def relative_error(self):
+        """Relative standard error of `count`."""
+        return 1.04 / math.sqrt(self.size)
+
+    def to_bytes(self):
+        return MAGIC + bytes([self.precision]) + bytes(self.registers)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError("Not a HyperLogLog sketch.")
+        sketch = cls(data[len(MAGIC)])
+        registers = data[len(MAGIC) + 1:]
+        if len(registers) != sketch.size:
+            raise ValueError("Truncated HyperLogLog sketch.")
+        sketch.registers = bytearray(registers)
+        return sketch
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+    def __len__(self):
+        return self.count()
+
+    def __repr__(self):
+        return f"HyperLogLog(precision={self.precision}, count~{self.count()})"
+
+
+def merge_all(sketches):
+    """Returns a new sketch that is the union of the given sketches."""
+    sketches = list(sketches)
+    merged = HyperLogLog(sketches[0].precision)
+    for sketch in sketches:
+        merged.merge(sketch)
+    return merged
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count or roll up HyperLogLog sketches.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    count_parser = subparsers.add_parser("count", help="estimate the distinct count of the union of sketches")
+    count_parser.add_argument("sketches", nargs="+")
+    merge_parser = subparsers.add_parser("merge", help="merge sketches into one file")
+    merge_parser.add_argument("output")
+    merge_parser.add_argument("sketches", nargs="+")
+    args = parser.parse_args()
+
+    merged = merge_all(HyperLogLog.load(path) for path in args.sketches)
+    if args.command == "merge":
+        merged.save(args.output)
+    print(f"About {merged.count()} different telephone numbers (+/- {merged.relative_error:.2%}).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Multi-core sharded aggregation for the P0 reports.
+
+Both logs are split into byte ranges aligned on line boundaries. Every range is
+read by a worker process that builds partial aggregators (sets, counters) for its
+records only, and the partials are merged, in file order, in a reduce step.
+
+Usage:
+    python parallel_engine.py [--workers N] [--texts texts.csv] [--calls calls.csv] [--approximate-precision P]
+"""
+import argparse
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from stream_engine import add_task_arguments, default_aggregators
+
+CHUNKS_PER_WORKER = 4
+
+
+def chunk_ranges(path, chunks):
+    """
+    Splits a file into at most `chunks` byte ranges that start and end on line boundaries.
+
+    Args:
+      path(str): path of the file.
+      chunks(int): requested number of ranges.
+
+    Returns:
+       a list of (start, end) byte offsets covering the whole file.
+    """
+    size = os.path.getsize(path)
+    boundaries = [0]
+    with open(path, 'rb') as f:
+        for index in range(1, chunks):
+            offset = size * index // chunks
+            if offset <= boundaries[-1]:
+                continue
+            f.seek(offset - 1)
+            f.readline()  # Move to the start of the next line, unless offset already is one.
+            position = f.tell()
+            if position >= size:
+                break
+            if position > boundaries[-1]:
+                boundaries.append(position)
+    boundaries.append(size)
+    return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start]
+
+
+def read_range(path, start, end):
+    """Lazily yields the csv records whose lines start in [start, end)."""
+    def lines():
+        with open(path, 'rb') as f:
+            f.seek(start)
+            position = start
+            while position < end:
+                line = f.readline()
+                if not line:
+                    return
+                position += len(line)
+                yield line.decode()
+
+    return csv.reader(lines())
+
+
+def aggregate_range(aggregator_factory, kind, path, start, end):
+    """Worker: builds partial aggregators over one byte range of the texts or calls log."""
+    aggregators = aggregator_factory()
+    handlers = [getattr(aggregator, f"add_{kind}") for aggregator in aggregators]
+    for record in read_range(path, start, end):
+        for handler in handlers:
+            handler(record)
+    return aggregators
+
+
+def run(aggregator_factory=default_aggregators, texts_path='texts.csv', calls_path='calls.csv', workers=None):
+    """
+    Parallel counterpart of `stream_engine.run`.
+
+    Args:
+      aggregator_factory(callable): module-level function returning fresh aggregators,
+        which must implement `merge`.
+      texts_path(str): path of the texts csv file.
+      calls_path(str): path of the calls csv file.
+      workers(int): number of worker processes, defaults to the number of cores.
+
+    Returns:
+       the merged aggregators.
+    """
+    workers = workers or os.cpu_count() or 1
+    merged = aggregator_factory()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = []
+        for kind, path in (("text", texts_path), ("call", calls_path)):
+            for start, end in chunk_ranges(path, workers * CHUNKS_PER_WORKER):
+                futures.append(executor.submit(aggregate_range, aggregator_factory, kind, path, start, end))
+        # Partials are reduced in file order so order-sensitive tasks (first/last record) stay correct.
+        for future in futures:
+            for aggregator, shard in zip(merged, future.result()):
+                aggregator.merge(shard)
+    return merged
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the P0 reports over a process pool.")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--texts", default="texts.csv")
+    parser.add_argument("--calls", default="calls.csv")
+    parser.add_argument("--approximate-precision", type=int, default=None,
+                        help="estimate Task1 with a HyperLogLog sketch of this precision")
+    add_task_arguments(parser)
+    args = parser.parse_args()
+
+    factory = partial(default_aggregators, approximate_precision=args.approximate_precision, tasks=args.tasks)
+    for aggregator in run(factory, args.texts, args.calls, args.workers):
+        for line in aggregator.report():
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+"""
+Single-pass streaming engine for the P0 reports.
+
+Instead of loading texts.csv and calls.csv into lists once per task, the
+engine reads each file once, record by record, and hands every record to
+all registered aggregators. Memory stays constant apart from the state the
+aggregators themselves keep (sets of numbers, duration totals, ...).
+"""
+import argparse
+import calendar
+import csv
+import time
+from collections import defaultdict
+
+from hyperloglog import HyperLogLog
+
+TASKS = range(5)
+
+
+def read_records(path):
+    """
+    Lazily yields the rows of a CSV file without materializing them.
+
+    Args:
+      path(str): path of the csv file.
+
+    Returns:
+       a generator of records (lists of fields).
+    """
+    with open(path, 'r') as f:
+        for record in csv.reader(f):
+            yield record
+
+
+class TimestampParser(object):
+    """
+    Parses "dd-mm-YYYY HH:MM:SS" timestamps into epoch seconds.
+    The date part is cached because a log only spans a handful of days.
+    """
+
+    def __init__(self):
+        self.days = {}
+
+    def __call__(self, timestamp):
+        date, clock = timestamp[:10], timestamp[11:]
+        day = self.days.get(date)
+        if day is None:
+            day = calendar.timegm(time.strptime(date, "%d-%m-%Y"))
+            self.days[date] = day
+        return day + int(clock[:2]) * 3600 + int(clock[3:5]) * 60 + int(clock[6:8])
+
+
+class Aggregator(object):
+    """
+    Base class of the task aggregators. Subclasses override the hooks they need.
+    """
+
+    def add_text(self, text):
+        pass
+
+    def add_call(self, call):
+        pass
+
+    def merge(self, other):
+        """
+        Folds the state of another aggregator of the same type into this one.
+        `other` must have seen the records that come after the ones seen by `self`.
+        """
+        raise NotImplementedError
+
+    def report(self):
+        """Returns the report of the task as a list of lines."""
+        return []
+
+
+class FirstAndLastRecord(Aggregator):
+    """TASK 0: first record of texts and last record of calls."""
+
+    def __init__(self):
+        self.first_text = None
+        self.last_call = None
+
+    def add_text(self, text):
+        if self.first_text is None:
+            self.first_text = text
+
+    def add_call(self, call):
+        self.last_call = call
+
+    def merge(self, other):
+        if self.first_text is None:
+            self.first_text = other.first_text
+        if other.last_call is not None:
+            self.last_call = other.last_call
+
+    def report(self):
+        lines = []
+        if self.first_text is not None:
+            text = self.first_text
+            lines.append(f"First record of texts, {text[0]} texts {text[1]} at time {text[2]}")
+        if self.last_call is not None:
+            call = self.last_call
+            lines.append(f"Last record of calls, {call[0]} calls {call[1]} at time {call[2]}, "
+                         f"lasting {call[3]} seconds")
+        return lines
+
+
+class UniqueNumbers(Aggregator):
+    """TASK 1: number of different telephone numbers in the records."""
+
+    def __init__(self):
+        self.unique_numbers = set()
+
+    def add_text(self, text):
+        self.unique_numbers.add(text[0])
+        self.unique_numbers.add(text[1])
+
+    def add_call(self, call):
+        self.unique_numbers.add(call[0])
+        self.unique_numbers.add(call[1])
+
+    def merge(self, other):
+        self.unique_numbers |= other.unique_numbers
+
+    def report(self):
+        return [f"There are {len(self.unique_numbers)} different telephone numbers in the records."]
+
+
+class ApproximateUniqueNumbers(Aggregator):
+    """TASK 1 in constant memory: a HyperLogLog estimate of the different telephone numbers."""
+
+    def __init__(self, precision=14):
+        self.sketch = HyperLogLog(precision)
+
+    def add_text(self, text):
+        self.sketch.add(text[0])
+        self.sketch.add(text[1])
+
+    def add_call(self, call):
+        self.sketch.add(call[0])
+        self.sketch.add(call[1])
+
+    def merge(self, other):
+        self.sketch.merge(other.sketch)
+
+    def report(self):
+        return [f"There are about {self.sketch.count()} different telephone numbers in the records "
+                f"(+/- {self.sketch.relative_error:.2%})."]
+
+
+class DurationPerNumber(Aggregator):
+    """TASK 2: telephone number that spent the longest time on the phone."""
+
+    def __init__(self, period="September 2016"):
+        self.records = defaultdict(int)
+        self.period = period
+
+    def add_call(self, call):
+        duration = int(call[-1])
+        self.records[call[0]] += duration
+        self.records[call[1]] += duration
+
+    def merge(self, other):
+        for key, value in other.records.items():
+            self.records[key] += value
+
+    def longest(self):
+        max_duration = 0
+        max_number = None
+        for key, value in self.records.items():
+            if value > max_duration:
+                max_duration = value
+                max_number = key
+        return max_number, max_duration
+
+    def report(self):
+        max_number, max_duration = self.longest()
+        return [f"{max_number} spent the longest time, {max_duration} seconds, on the phone during {self.period}."]
+
+
+class BangaloreCodes(Aggregator):
+    """TASK 3: codes called from Bangalore and the share of calls staying in Bangalore."""
+    Bangalore_code = "(080)"
+    Mobile_numbers_code = "789"
+    Telemarketers_code = "140"
+
+    def __init__(self):
+        self.codes = set()
+        self.number_of_calls = 0
+        self.Bangalore_calls = 0
+
+    def add_call(self, call):
+        if call[0][:5] != self.Bangalore_code:
+            return
+        self.number_of_calls += 1
+        receiver = call[1]
+        if receiver[0] == '(':
+            receiver_code = receiver[:receiver.index(')') + 1]
+            if receiver_code == self.Bangalore_code:
+                self.Bangalore_calls += 1
+            self.codes.add(receiver_code)
+        elif receiver[0] in self.Mobile_numbers_code:
+            self.codes.add(receiver[:4])
+        elif receiver[:3] == self.Telemarketers_code:
+            self.codes.add(self.Telemarketers_code)
+
+    def merge(self, other):
+        self.codes |= other.codes
+        self.number_of_calls += other.number_of_calls
+        self.Bangalore_calls += other.Bangalore_calls
+
+    def report(self):
+        lines = ["The numbers called by people in Bangalore have codes:"]
+        lines.extend(sorted(self.codes))
+        percentage = round((self.Bangalore_calls / self.number_of_calls) * 100, 2) if self.number_of_calls else 0
+        lines.append(f"{percentage} percent of calls from fixed lines in Bangalore are"
+                     f" calls to other fixed lines in Bangalore.")
+        return lines
+
+
+class Telemarketers(Aggregator):
+    """TASK 4: numbers that only make outgoing calls."""
+
+    def __init__(self):
+        self.callers = set()
+        self.receivers = set()
+        self.text_senders = set()
+        self.text_receivers = set()
+
+    def add_text(self, text):
+        self.text_senders.add(text[0])
+        self.text_receivers.add(text[1])
+
+    def add_call(self, call):
+        self.callers.add(call[0])
+        self.receivers.add(call[1])
+
+    def merge(self, other):
+        self.callers |= other.callers
+        self.receivers |= other.receivers
+        self.text_senders |= other.text_senders
+        self.text_receivers |= other.text_receivers
+
+    def marketers(self):
+        return sorted(self.callers - self.receivers - self.text_senders - self.text_receivers)
+
+    def report(self):
+        return ["These numbers could be telemarketers: "] + self.marketers()
+
+
+def default_aggregators(approximate_precision=None, tasks=TASKS):
+    """
+    Returns one fresh aggregator per task, in task order.
+
+    Args:
+      approximate_precision(int): if given, Task1 is estimated with a HyperLogLog
+        sketch of that precision instead of an exact set.
+      tasks(sequence): task numbers to build aggregators for, all of them by default.
+    """
+    if approximate_precision is None:
+        unique_numbers = UniqueNumbers
+    else:
+        unique_numbers = lambda: ApproximateUniqueNumbers(approximate_precision)
+    builders = [FirstAndLastRecord, unique_numbers, DurationPerNumber, BangaloreCodes, Telemarketers]
+    return [builders[task]() for task in sorted(tasks)]
+
+
+def add_task_arguments(parser):
+    """Adds the --tasks option shared by the command line tools."""
+    parser.add_argument("--tasks", type=int, nargs="+", default=list(TASKS), choices=TASKS,
+                        help="task numbers to report, all of them by default")
+
+
+def run(aggregators, texts_path='texts.csv', calls_path='calls.csv'):
+    """
+    Streams each file once and feeds every record to every aggregator.
+
+    Args:
+      aggregators(list): aggregators to update.
+      texts_path(str): path of the texts csv file.
+      calls_path(str): path of the calls csv file.
+
+    Returns:
+       the aggregators, updated.
+    """
+    text_handlers = [aggregator.add_text for aggregator in aggregators]
+    for text in read_records(texts_path):
+        for handler in text_handlers:
+            handler(text)
+
+    call_handlers = [aggregator.add_call for aggregator in aggregators]
+    for call in read_records(calls_path):
+        for handler in call_handlers:
+            handler(call)
+    return aggregators
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the P0 reports in a single streaming pass.")
+    parser.add_argument("--texts", default="texts.csv")
+    parser.add_argument("--calls", default="calls.csv")
+    parser.add_argument("--approximate-precision", type=int, default=None,
+                        help="estimate Task1 with a HyperLogLog sketch of this precision")
+    parser.add_argument("--save-sketch", default=None, help="write the Task1 sketch to this file")
+    add_task_arguments(parser)
+    args = parser.parse_args()
+
+    aggregators = run(default_aggregators(args.approximate_precision, args.tasks), args.texts, args.calls)
+    for aggregator in aggregators:
+        for line in aggregator.report():
+            print(line)
+        if args.save_sketch and isinstance(aggregator, ApproximateUniqueNumbers):
+            aggregator.sketch.save(args.save_sketch)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Incremental, append-only telemarketer detection (TASK 4).
+
+Instead of computing `callers - receivers - text_senders - text_receivers` over
+the whole history, the detector keeps the four sets and the candidate set up to
+date as every call or text arrives: a call or text can only add its caller to the
+candidates or remove the numbers it excludes, so each update is O(1) and the
+current candidates are always available.
+
+The state, including how far each log has been read, is saved to a json file,
+so a periodic run only reads the records appended since the previous run.
+
+With a false-positive rate, the exclusion sets (receivers, text senders and text
+receivers) are replaced by a single Bloom filter, since they are only ever tested
+as a union, and the full callers set is not kept. Only the candidates stay exact.
+A number can then be wrongly excluded with about the configured probability.
+
+Usage:
+    python telemarketers.py <state.json> [--texts texts.csv] [--calls calls.csv]
+                            [--false-positive-rate P --expected-numbers N]
+"""
+import argparse
+import base64
+import csv
+import json
+import os
+
+from bloom_filter import BloomFilter
+from stream_engine import Aggregator
+
+SET_NAMES = ("callers", "receivers", "text_senders", "text_receivers", "candidates")
+
+
+def read_new_records(path, offset):
+    """
+    Yields (record, offset after the record) for the complete lines of a file after `offset`.
+    A trailing line without a newline is left for the next read, since it may still be written.
+    """
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                return
+            offset += len(line)
+            for record in csv.reader([line.decode()]):
+                if record:
+                    yield record, offset
+
+
+class TelemarketerDetector(Aggregator):
+
+    def __init__(self, false_positive_rate=None, expected_numbers=10 ** 6):
+        """
+        Args:
+          false_positive_rate(float): if given, exclusions are kept in a Bloom filter with this rate.
+          expected_numbers(int): number of distinct excluded numbers the Bloom filter is sized for.
+        """
+        self.false_positive_rate = false_positive_rate
+        self.candidates = set()
+        self.offsets = {}
+        if false_positive_rate is None:
+            self.callers = set()
+            self.receivers = set()
+            self.text_senders = set()
+            self.text_receivers = set()
+            self.exclusion_filter = None
+        else:
+            self.callers = self.receivers = self.text_senders = self.text_receivers = None
+            self.exclusion_filter = BloomFilter(expected_numbers, false_positive_rate)
+
+    def is_excluded(self, number):
+        if self.exclusion_filter is not None:
+            return number in self.exclusion_filter
+        return number in self.receivers or number in self.text_senders or number in self.text_receivers
+
+    def _exclude(self, number, exact_set):
+        if self.exclusion_filter is not None:
+            self.exclusion_filter.add(number)
+        else:
+            exact_set.add(number)
+        self.candidates.discard(number)
+
+    def add_call(self, call):
+        caller, receiver = call[0], call[1]
+        self._exclude(receiver, self.receivers)
+        if self.callers is not None:
+            self.callers.add(caller)
+        if not self.is_excluded(caller):
+            self.candidates.add(caller)
+
+    def add_text(self, text):
+        self._exclude(text[0], self.text_senders)
+        self._exclude(text[1], self.text_receivers)
+
+    def merge(self, other):
+        if self.exclusion_filter is not None:
+            self.exclusion_filter.merge(other.exclusion_filter)
+        else:
+            self.callers |= other.callers
+            self.receivers |= other.receivers
+            self.text_senders |= other.text_senders
+            self.text_receivers |= other.text_receivers
+        self.candidates = {caller for caller in self.candidates | other.candidates if not self.is_excluded(caller)}
+
+    def is_candidate(self, number):
+        return number in self.candidates
+
+    def consume(self, path, kind):
+        """
+        Feeds the records appended to a log since the last call and remembers the offset reached.
+
+        Args:
+          path(str): path of the texts or calls csv file.
+          kind(str): "text" or "call".
+
+        Returns:
+           the number of new records.
+        """
+        handler = self.add_text if kind == "text" else self.add_call
+        key = os.path.abspath(path)
+        count = 0
+        for record, offset in read_new_records(path, self.offsets.get(key, 0)):
+            handler(record)
+            self.offsets[key] = offset
+            count += 1
+        return count
+
+    def report(self):
+        lines = ["These numbers could be telemarketers: "] + sorted(self.candidates)
+        if self.exclusion_filter is not None:
+            lines.append(f"(exclusions kept in a Bloom filter configured with a "
+                         f"{self.false_positive_rate * 100:g}% false-positive rate)")
+        return lines
+
+    def save(self, path):
+        state = {name: sorted(getattr(self, name)) for name in SET_NAMES if getattr(self, name) is not None}
+        state["offsets"] = self.offsets
+        if self.exclusion_filter is not None:
+            state["false_positive_rate"] = self.false_positive_rate
+            state["exclusion_filter"] = base64.b64encode(self.exclusion_filter.to_bytes()).decode()
+        temporary_path = path + ".tmp"
+        with open(temporary_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def load(cls, path, false_positive_rate=None, expected_numbers=10 ** 6):
+        """
+        Loads a saved detector, or returns a new one configured with the given arguments
+        if `path` does not exist yet. A saved detector keeps the mode it was created with.
+        """
+        if not os.path.exists(path):
+            return cls(false_positive_rate, expected_numbers)
+        with open(path, 'r') as f:
+            state = json.load(f)
+        detector = cls()
+        if "exclusion_filter" in state:
+            detector.false_positive_rate = state["false_positive_rate"]
+            detector.exclusion_filter = BloomFilter.from_bytes(base64.b64decode(state["exclusion_filter"]),
+                                                               detector.false_positive_rate)
+        for name in SET_NAMES:
+            setattr(detector, name, set(state[name]) if name in state else None)
+        detector.offsets = state["offsets"]
+        return detector
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Update the telemarketer candidates with newly appended records.")
+    parser.add_argument("state", help="json file holding the detector state, created if missing")
+    parser.add_argument("--texts", default="texts.csv")
+    parser.add_argument("--calls", default="calls.csv")
+    parser.add_argument("--false-positive-rate", type=float, default=None,
+                        help="keep the exclusion sets in a Bloom filter with this false-positive rate")
+    parser.add_argument("--expected-numbers", type=int, default=10 ** 6,
+                        help="number of distinct numbers the Bloom filter is sized for")
+    args = parser.parse_args()
+
+    detector = TelemarketerDetector.load(args.state, args.false_positive_rate, args.expected_numbers)
+    detector.consume(args.texts, "text")
+    detector.consume(args.calls, "call")
+    detector.save(args.state)
+    for line in detector.report():
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
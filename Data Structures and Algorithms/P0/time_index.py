@@ -0,0 +1,191 @@
+"""
+Time-windowed call analytics over a sorted timestamp index.
+
+`TimeIndex` parses the timestamp column of a log once and keeps the records sorted
+by time next to a compact array of epoch seconds, so the records of any window are
+located with two binary searches. The task aggregators then run only over that
+slice, either for one window or for consecutive tumbling or sliding windows.
+
+Usage:
+    python time_index.py --start "2016-09-10 09:00" --end "2016-09-10 12:00"
+    python time_index.py --tumbling 1d --tasks 3
+    python time_index.py --sliding 6h --step 1h --tasks 2
+"""
+import argparse
+import calendar
+import datetime
+from array import array
+from bisect import bisect_left
+
+from stream_engine import (BangaloreCodes, DurationPerNumber, FirstAndLastRecord, Telemarketers, TimestampParser,
+                           UniqueNumbers, add_task_arguments, read_records)
+
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+
+def parse_time(value):
+    """
+    Converts a window bound into epoch seconds.
+    Accepts epoch seconds, ISO dates ("2016-09-10 09:00") or the log format ("10-09-2016 09:00:00").
+    """
+    if isinstance(value, (int, float)):
+        return int(value)
+    try:
+        moment = datetime.datetime.fromisoformat(value)
+    except ValueError:
+        return TimestampParser()(value)
+    return calendar.timegm(moment.timetuple())
+
+
+def parse_duration(value):
+    """Converts "90s", "15m", "6h", "1d" or "1w" (or plain seconds) into seconds."""
+    if isinstance(value, (int, float)):
+        return int(value)
+    if value[-1] in DURATION_UNITS:
+        return int(value[:-1]) * DURATION_UNITS[value[-1]]
+    return int(value)
+
+
+def format_time(timestamp):
+    return datetime.datetime.fromtimestamp(timestamp, tz=datetime.timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+class TimeIndex(object):
+
+    def __init__(self, records, timestamp_column=2):
+        parse_timestamp = TimestampParser()
+        timestamps = [parse_timestamp(record[timestamp_column]) for record in records]
+        order = sorted(range(len(records)), key=timestamps.__getitem__)
+        self.records = [records[position] for position in order]
+        self.timestamps = array('q', (timestamps[position] for position in order))
+
+    @classmethod
+    def from_csv(cls, path):
+        return cls(list(read_records(path)))
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def first(self):
+        return self.timestamps[0] if self.timestamps else None
+
+    @property
+    def last(self):
+        return self.timestamps[-1] if self.timestamps else None
+
+    def bounds(self, start=None, end=None):
+        """Returns the positions of the first record at or after start and the first at or after end."""
+        low = 0 if start is None else bisect_left(self.timestamps, parse_time(start))
+        high = len(self.records) if end is None else bisect_left(self.timestamps, parse_time(end), low)
+        return low, high
+
+    def window(self, start=None, end=None):
+        """Returns the records with start <= timestamp < end, in time order."""
+        low, high = self.bounds(start, end)
+        return self.records[low:high]
+
+
+def time_bounds(indexes):
+    """Returns (first timestamp, last timestamp + 1) over the non-empty indexes, or None if all are empty."""
+    non_empty = [index for index in indexes if len(index)]
+    if not non_empty:
+        return None
+    return min(index.first for index in non_empty), max(index.last for index in non_empty) + 1
+
+
+def window_starts(indexes, size, step, start=None, end=None):
+    """
+    Yields (window start, window end) pairs covering [start, end) with the given size and step.
+    Without an explicit start, windows are aligned on multiples of the step, so daily windows start at midnight.
+    """
+    bounds = time_bounds(indexes)
+    if bounds is None or step <= 0:
+        return
+    start = bounds[0] // step * step if start is None else parse_time(start)
+    end = bounds[1] if end is None else parse_time(end)
+    current = start
+    while current < end:
+        yield current, min(current + size, end)
+        current += step
+
+
+def run_window(aggregators, texts_index, calls_index, start=None, end=None):
+    """Feeds the texts and calls of one window to the aggregators."""
+    text_handlers = [aggregator.add_text for aggregator in aggregators]
+    for text in texts_index.window(start, end):
+        for handler in text_handlers:
+            handler(text)
+    call_handlers = [aggregator.add_call for aggregator in aggregators]
+    for call in calls_index.window(start, end):
+        for handler in call_handlers:
+            handler(call)
+    return aggregators
+
+
+def windowed(aggregator_factory, texts_index, calls_index, size, step=None, start=None, end=None):
+    """
+    Runs fresh aggregators over consecutive windows.
+    Windows are tumbling when step is None (or equal to size) and sliding otherwise.
+
+    Returns:
+       a generator of (window start, window end, aggregators).
+    """
+    size = parse_duration(size)
+    step = size if step is None else parse_duration(step)
+    for window_start, window_end in window_starts((texts_index, calls_index), size, step, start, end):
+        yield window_start, window_end, run_window(aggregator_factory(window_start, window_end), texts_index,
+                                                   calls_index, window_start, window_end)
+
+
+def task_aggregators(tasks):
+    """Returns a factory building the aggregators of the given task numbers for a window."""
+    def factory(start, end):
+        period = f"{format_time(start)} to {format_time(end)}"
+        builders = {
+            0: FirstAndLastRecord,
+            1: UniqueNumbers,
+            2: lambda: DurationPerNumber(period),
+            3: BangaloreCodes,
+            4: Telemarketers,
+        }
+        return [builders[task]() for task in tasks]
+    return factory
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the P0 reports over time windows.")
+    parser.add_argument("--texts", default="texts.csv")
+    parser.add_argument("--calls", default="calls.csv")
+    parser.add_argument("--start", default=None, help="window start, e.g. \"2016-09-10 09:00\"")
+    parser.add_argument("--end", default=None, help="window end (exclusive)")
+    parser.add_argument("--tumbling", default=None, help="tumbling window size, e.g. 1d or 6h")
+    parser.add_argument("--sliding", default=None, help="sliding window size, used with --step")
+    parser.add_argument("--step", default=None, help="sliding window step, e.g. 1h")
+    add_task_arguments(parser)
+    args = parser.parse_args()
+
+    texts_index = TimeIndex.from_csv(args.texts)
+    calls_index = TimeIndex.from_csv(args.calls)
+    factory = task_aggregators(args.tasks)
+    size = args.tumbling or args.sliding
+    if size is None:
+        bounds = time_bounds((texts_index, calls_index))
+        if bounds is None and not (args.start and args.end):
+            return  # Both logs are empty, there is no period to report on
+        start = parse_time(args.start) if args.start else bounds[0]
+        end = parse_time(args.end) if args.end else bounds[1]
+        windows = [(start, end, run_window(factory(start, end), texts_index, calls_index, start, end))]
+    else:
+        windows = windowed(factory, texts_index, calls_index, size, args.step if args.sliding else None,
+                           args.start, args.end)
+
+    for window_start, window_end, aggregators in windows:
+        print(f"=== {format_time(window_start)} to {format_time(window_end)} ===")
+        for aggregator in aggregators:
+            for line in aggregator.report():
+                print(line)
+
+
+if __name__ == "__main__":
+    main()
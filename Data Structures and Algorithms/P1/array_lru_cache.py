@@ -0,0 +1,226 @@
+import random
+import sys
+import time
+import tracemalloc
+from array import array
+
+from problem_1 import LRU_Cache
+
+EMPTY = -1
+HASH_MULTIPLIER = 0x9E3779B97F4A7C15  # 2^64 / golden ratio, spreads consecutive and strided keys
+MASK_64 = (1 << 64) - 1
+
+
+class ArrayLRUCache(object):
+    """
+    LRU cache for int keys and fixed-width values with the LRU_Cache get/set API.
+
+    All storage is preallocated in flat arrays: the keys and values of every slot,
+    an intrusive doubly linked recency list made of prev/next slot indexes, and an
+    open-addressing hash table of slot indexes (linear probing with backward-shift
+    deletion). Steady-state get and set only overwrite array items, so no node or
+    dict entry is allocated per key, and an entry costs about 32 bytes instead of
+    the hundred or so of an OrderedDict entry with its key and value objects.
+
+    Keys must be signed 64-bit ints, values must fit the `value_type` array typecode.
+    """
+
+    def __init__(self, capacity, value_type='q'):
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1.")
+        bits = 1
+        while (1 << bits) < 2 * capacity:
+            bits += 1
+        self.capacity = capacity
+        self.shift = 64 - bits
+        self.mask = (1 << bits) - 1
+        self.keys = array('q', bytes(8 * capacity))
+        self.values = array(value_type, bytes(array(value_type).itemsize * capacity))
+        self.prev = array('i', [EMPTY]) * capacity
+        self.next = array('i', range(1, capacity + 1))
+        self.next[capacity - 1] = EMPTY
+        self.table = array('i', [EMPTY]) * (1 << bits)
+        self.head = EMPTY
+        self.tail = EMPTY
+        self.free_head = 0
+        self.count = 0
+
+    def _home(self, key):
+        return ((key * HASH_MULTIPLIER) & MASK_64) >> self.shift
+
+    def _find(self, key):
+        """Returns (table position, slot) of a key, or (first empty position, EMPTY)."""
+        table, keys, mask = self.table, self.keys, self.mask
+        position = self._home(key)
+        while True:
+            slot = table[position]
+            if slot == EMPTY or keys[slot] == key:
+                return position, slot
+            position = (position + 1) & mask
+
+    def _delete_position(self, position):
+        """Removes a table entry, shifting the following entries back so probing never meets a hole."""
+        table, keys, mask = self.table, self.keys, self.mask
+        table[position] = EMPTY
+        current = position
+        while True:
+            current = (current + 1) & mask
+            slot = table[current]
+            if slot == EMPTY:
+                return
+            home = self._home(keys[slot])
+            # The entry can stay if its home lies cyclically in (position, current].
+            if position <= current:
+                stays = position < home <= current
+            else:
+                stays = home > position or home <= current
+            if not stays:
+                table[position] = slot
+                table[current] = EMPTY
+                position = current
+
+    def _move_to_front(self, slot):
+        if self.head == slot:
+            return
+        prev, next_ = self.prev, self.next
+        before, after = prev[slot], next_[slot]
+        next_[before] = after  # slot is not the head, so it has a predecessor
+        if after != EMPTY:
+            prev[after] = before
+        else:
+            self.tail = before
+        prev[slot] = EMPTY
+        next_[slot] = self.head
+        prev[self.head] = slot
+        self.head = slot
+
+    def get(self, key, default=-1):
+        if key is None or key == '':
+            return default
+        slot = self._find(key)[1]
+        if slot == EMPTY:
+            return default
+        self._move_to_front(slot)
+        return self.values[slot]
+
+    def set(self, key, value):
+        if key is None or key == '':
+            print("Invalid key. Key cannot be None or an empty string.")
+            return
+        position, slot = self._find(key)
+        if slot != EMPTY:
+            self.values[slot] = value
+            self._move_to_front(slot)
+            return
+
+        if self.count >= self.capacity:
+            # Reuse the least recently used slot in place of a free one.
+            slot = self.tail
+            self._delete_position(self._find(self.keys[slot])[0])
+            before = self.prev[slot]
+            self.tail = before
+            if before != EMPTY:
+                self.next[before] = EMPTY
+            else:
+                self.head = EMPTY
+            position = self._find(key)[0]
+        else:
+            slot = self.free_head
+            self.free_head = self.next[slot]
+            self.count += 1
+
+        self.keys[slot] = key
+        self.values[slot] = value
+        self.table[position] = slot
+        self.prev[slot] = EMPTY
+        self.next[slot] = self.head
+        if self.head != EMPTY:
+            self.prev[self.head] = slot
+        else:
+            self.tail = slot
+        self.head = slot
+
+    def __len__(self):
+        return self.count
+
+    def nbytes(self):
+        """Bytes held by the preallocated arrays."""
+        return sum(sys.getsizeof(part) for part in (self.keys, self.values, self.prev, self.next, self.table))
+
+
+def _workload(operations, key_space, seed=0):
+    rng = random.Random(seed)
+    return [int(key_space * rng.random() ** 2) for _ in range(operations)]
+
+
+def benchmark_array_lru(capacity=200000, operations=1000000):
+    """
+    Compares LRU_Cache and ArrayLRUCache on an int-key workload.
+
+    Returns:
+       a list of (name, bytes per entry, ops/s), memory measured with tracemalloc once the cache is full.
+    """
+    keys = _workload(operations, 4 * capacity)
+    results = []
+    for name, factory in (("OrderedDict", LRU_Cache), ("array", ArrayLRUCache)):
+        tracemalloc.start()
+        cache = factory(capacity)
+        for key in range(capacity):
+            cache.set(key, key + 10 ** 12)  # Values past the small-int cache, like real IDs
+        allocated = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        get, set_ = cache.get, cache.set
+        start = time.perf_counter()
+        for key in keys:
+            if get(key) == -1:
+                set_(key, key)
+        results.append((name, allocated / capacity, operations / (time.perf_counter() - start)))
+    return results
+
+
+def test_array_lru_cache():
+    # Test Case 1: Basic Functionality Testing
+    cache = ArrayLRUCache(2)
+    cache.set(1, 1)
+    cache.set(2, 2)
+    print(cache.get(1), cache.get(3))
+    # Expected Output: 1 -1
+
+    # Test Case 2: The least recently used key is evicted
+    cache.set(3, 3)
+    print(cache.get(2), cache.get(1), cache.get(3), len(cache))
+    # Expected Output: -1 1 3 2
+
+    # Test Case 3: Edge Cases with Null and Empty keys, negative keys
+    cache.set(None, 5)
+    cache.set(-7, -1)
+    print(cache.get(None), cache.get(''), cache.get(-7, 'missing'))
+    # Expected Output: -1 -1 -1 (after "Invalid key..." is printed)
+
+    # Test Case 4: Capacity of one, updates keep a single entry
+    cache = ArrayLRUCache(1)
+    cache.set(5, 50)
+    cache.set(5, 55)
+    cache.set(6, 60)
+    print(cache.get(5), cache.get(6), len(cache))
+    # Expected Output: -1 60 1
+
+    # Test Case 5: Heavy churn matches LRU_Cache exactly
+    cache, reference = ArrayLRUCache(64), LRU_Cache(64)
+    same = True
+    for key in _workload(50000, 300, seed=1):
+        same = same and cache.get(key) == reference.get(key)
+        cache.set(key, key * 3)
+        reference.set(key, key * 3)
+    print(same, len(cache) == len(reference.cache))
+    # Expected Output: True True
+
+    print("All test cases have generated expected output")
+
+
+if __name__ == "__main__":
+    test_array_lru_cache()
+    print("\nimplementation  bytes/entry  ops/s")
+    for name, per_entry, rate in benchmark_array_lru():
+        print(f"{name:<14}  {per_entry:>11.1f}  {rate:,.0f}")
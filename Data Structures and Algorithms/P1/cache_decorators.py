@@ -0,0 +1,153 @@
+import asyncio
+import functools
+
+from problem_1 import LRU_Cache
+
+# Returned by the cache on a miss, so a cached -1 (or None) is a hit like any other value.
+MISSING = object()
+
+
+def make_key(args, kwargs):
+    """Builds a hashable cache key from the arguments of a call."""
+    if not kwargs:
+        return args
+    return args, tuple(sorted(kwargs.items()))
+
+
+def lru_cached(capacity=128, cache=None, key=make_key):
+    """
+    Memoizes a function in an LRU_Cache.
+
+    Args:
+      capacity(int): capacity of the cache created for the function.
+      cache: an existing cache to use instead, anything with LRU_Cache's get(key, default) and set(key, value).
+      key(callable): builds the cache key from (args, kwargs).
+
+    Returns:
+       a decorator. The wrapped function exposes its cache as `.cache`.
+    """
+    def decorator(function):
+        store = cache if cache is not None else LRU_Cache(capacity)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            cache_key = key(args, kwargs)
+            value = store.get(cache_key, MISSING)
+            if value is MISSING:
+                value = function(*args, **kwargs)
+                store.set(cache_key, value)
+            return value
+
+        wrapper.cache = store
+        return wrapper
+    return decorator
+
+
+def async_lru_cached(capacity=128, cache=None, key=make_key):
+    """
+    Memoizes a coroutine function in an LRU_Cache, with single-flight de-duplication:
+    concurrent calls for a key that is being computed await the same computation
+    instead of starting their own. Failures are not cached and reach every waiter.
+
+    Args:
+      capacity(int): capacity of the cache created for the function.
+      cache: an existing cache to use instead, anything with LRU_Cache's get(key, default) and set(key, value).
+      key(callable): builds the cache key from (args, kwargs).
+
+    Returns:
+       a decorator. The wrapped function exposes its cache as `.cache`.
+    """
+    def decorator(function):
+        store = cache if cache is not None else LRU_Cache(capacity)
+        in_flight = {}
+
+        async def compute(cache_key, args, kwargs):
+            try:
+                value = await function(*args, **kwargs)
+                store.set(cache_key, value)
+                return value
+            finally:
+                del in_flight[cache_key]
+
+        @functools.wraps(function)
+        async def wrapper(*args, **kwargs):
+            cache_key = key(args, kwargs)
+            value = store.get(cache_key, MISSING)
+            if value is not MISSING:
+                return value
+            task = in_flight.get(cache_key)
+            if task is None:
+                task = in_flight[cache_key] = asyncio.ensure_future(compute(cache_key, args, kwargs))
+            # Shielded, so a cancelled caller does not cancel the computation the others await.
+            return await asyncio.shield(task)
+
+        wrapper.cache = store
+        wrapper.in_flight = in_flight
+        return wrapper
+    return decorator
+
+
+def test_cache_decorators():
+    calls = []
+
+    @lru_cached(capacity=2)
+    def lookup(number):
+        calls.append(number)
+        return -1 if number < 0 else number * 2
+
+    # Test Case 1: Repeated calls are served from the cache
+    print(lookup(2), lookup(2), len(calls))
+    # Expected Output: 4 4 1
+
+    # Test Case 2: A legitimate -1 is cached too
+    print(lookup(-5), lookup(-5), len(calls))
+    # Expected Output: -1 -1 2
+
+    # Test Case 3: Keyword arguments are part of the key
+    @lru_cached()
+    def power(base, exponent=2):
+        return base ** exponent
+    print(power(3), power(3, exponent=3))
+    # Expected Output: 9 27
+
+    # Test Case 4: 500 coroutines on a cold key compute it once
+    computations = []
+
+    @async_lru_cached(capacity=10)
+    async def fetch(key):
+        computations.append(key)
+        await asyncio.sleep(0.01)
+        return key.upper()
+
+    async def stampede():
+        return await asyncio.gather(*(fetch("cold") for _ in range(500)))
+
+    results = asyncio.run(stampede())
+    print(set(results), len(computations), len(fetch.in_flight))
+    # Expected Output: {'COLD'} 1 0
+
+    # Test Case 5: Failures are not cached, the next call computes again
+    attempts = []
+
+    @async_lru_cached()
+    async def flaky(key):
+        attempts.append(key)
+        if len(attempts) == 1:
+            raise ValueError("upstream failure")
+        return key
+
+    async def retry():
+        try:
+            await flaky("k")
+        except ValueError:
+            pass
+        return await flaky("k")
+
+    print(asyncio.run(retry()), len(attempts))
+    # Expected Output: k 2
+
+    print("All test cases have generated expected output")
+
+
+if __name__ == "__main__":
+    test_cache_decorators()
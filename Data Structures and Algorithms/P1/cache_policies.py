@@ -0,0 +1,369 @@
+import argparse
+import random
+from collections import OrderedDict
+
+from problem_1 import LRU_Cache
+
+
+def is_valid_key(key):
+    return not (key is None or key == '')
+
+
+class CountMinSketch(object):
+    """
+    Approximate access frequencies in a fixed number of small counters.
+    Counters saturate at `max_count` and are all halved every `sample_size` increments,
+    so old popularity fades away.
+    """
+
+    def __init__(self, width, depth=4, max_count=15, sample_size=None):
+        self.width = max(width, 1)
+        self.depth = depth
+        self.max_count = max_count
+        self.sample_size = sample_size or 10 * self.width
+        self.rows = [[0] * self.width for _ in range(depth)]
+        self.additions = 0
+
+    def _indexes(self, key):
+        return [hash((seed, key)) % self.width for seed in range(self.depth)]
+
+    def increment(self, key):
+        for row, index in zip(self.rows, self._indexes(key)):
+            if row[index] < self.max_count:
+                row[index] += 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self.reset()
+
+    def estimate(self, key):
+        return min(row[index] for row, index in zip(self.rows, self._indexes(key)))
+
+    def reset(self):
+        for row in self.rows:
+            for index in range(self.width):
+                row[index] >>= 1
+        self.additions //= 2
+
+
+class WTinyLFUCache(object):
+    """
+    W-TinyLFU: a small LRU admission window in front of a segmented LRU main space.
+    A key leaving the window only enters the main space if the frequency sketch says
+    it is used more often than the key it would evict, so one pass over cold keys
+    cannot flush the popular ones.
+    """
+
+    def __init__(self, capacity, window_ratio=0.01, protected_ratio=0.8):
+        self.capacity = capacity
+        self.window_capacity = max(1, int(capacity * window_ratio)) if capacity > 1 else capacity
+        main_capacity = capacity - self.window_capacity
+        self.protected_capacity = int(main_capacity * protected_ratio)
+        self.main_capacity = main_capacity
+        self.window = OrderedDict()
+        self.probation = OrderedDict()
+        self.protected = OrderedDict()
+        self.sketch = CountMinSketch(capacity)
+
+    def get(self, key):
+        if not is_valid_key(key):
+            return -1
+        self.sketch.increment(key)
+        if key in self.window:
+            self.window.move_to_end(key)
+            return self.window[key]
+        if key in self.protected:
+            self.protected.move_to_end(key)
+            return self.protected[key]
+        if key in self.probation:
+            value = self.probation.pop(key)
+            self._protect(key, value)
+            return value
+        return -1
+
+    def set(self, key, value):
+        if not is_valid_key(key):
+            print("Invalid key. Key cannot be None or an empty string.")
+            return
+        self.sketch.increment(key)
+        for segment in (self.window, self.protected):
+            if key in segment:
+                segment[key] = value
+                segment.move_to_end(key)
+                return
+        if key in self.probation:
+            del self.probation[key]
+            self._protect(key, value)
+            return
+
+        self.window[key] = value
+        if len(self.window) > self.window_capacity:
+            self._admit(*self.window.popitem(last=False))
+
+    def _protect(self, key, value):
+        self.protected[key] = value
+        if len(self.protected) > self.protected_capacity:
+            demoted_key, demoted_value = self.protected.popitem(last=False)
+            self.probation[demoted_key] = demoted_value
+            self._trim_probation()
+
+    def _admit(self, key, value):
+        if len(self.probation) + len(self.protected) < self.main_capacity:
+            self.probation[key] = value
+            return
+        if not self.probation:
+            return
+        victim = next(iter(self.probation))
+        if self.sketch.estimate(key) > self.sketch.estimate(victim):
+            del self.probation[victim]
+            self.probation[key] = value
+
+    def _trim_probation(self):
+        while self.probation and len(self.probation) + len(self.protected) > self.main_capacity:
+            self.probation.popitem(last=False)
+
+    def __len__(self):
+        return len(self.window) + len(self.probation) + len(self.protected)
+
+
+class ARCCache(object):
+    """
+    Adaptive Replacement Cache: recency (T1) and frequency (T2) lists plus ghost lists
+    (B1, B2) of recently evicted keys, used to adapt the target size p of T1. Keys seen
+    only once during a scan stay in T1 and are evicted before the frequent keys of T2.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.p = 0
+        self.t1 = OrderedDict()
+        self.t2 = OrderedDict()
+        self.b1 = OrderedDict()
+        self.b2 = OrderedDict()
+
+    def get(self, key):
+        if not is_valid_key(key):
+            return -1
+        if key in self.t1:
+            value = self.t1.pop(key)
+            self.t2[key] = value
+            return value
+        if key in self.t2:
+            self.t2.move_to_end(key)
+            return self.t2[key]
+        return -1
+
+    def set(self, key, value):
+        if not is_valid_key(key):
+            print("Invalid key. Key cannot be None or an empty string.")
+            return
+        if self.capacity <= 0:
+            return
+        if key in self.t1:
+            del self.t1[key]
+            self.t2[key] = value
+            return
+        if key in self.t2:
+            self.t2[key] = value
+            self.t2.move_to_end(key)
+            return
+
+        if key in self.b1:
+            self.p = min(self.capacity, self.p + max(len(self.b2) // len(self.b1), 1))
+            self._replace(key)
+            del self.b1[key]
+            self.t2[key] = value
+            return
+        if key in self.b2:
+            self.p = max(0, self.p - max(len(self.b1) // len(self.b2), 1))
+            self._replace(key)
+            del self.b2[key]
+            self.t2[key] = value
+            return
+
+        if len(self.t1) + len(self.b1) >= self.capacity:
+            if len(self.t1) < self.capacity:
+                self.b1.popitem(last=False)
+                self._replace(key)
+            else:
+                self.t1.popitem(last=False)
+        else:
+            total = len(self.t1) + len(self.t2) + len(self.b1) + len(self.b2)
+            if total >= self.capacity:
+                if total >= 2 * self.capacity:
+                    self.b2.popitem(last=False)
+                self._replace(key)
+        self.t1[key] = value
+
+    def _replace(self, key):
+        if len(self.t1) + len(self.t2) < self.capacity:
+            return
+        if self.t1 and (len(self.t1) > self.p or (key in self.b2 and len(self.t1) == self.p)):
+            evicted_key, _ = self.t1.popitem(last=False)
+            self.b1[evicted_key] = None
+        elif self.t2:
+            evicted_key, _ = self.t2.popitem(last=False)
+            self.b2[evicted_key] = None
+        else:
+            evicted_key, _ = self.t1.popitem(last=False)
+            self.b1[evicted_key] = None
+
+    def __len__(self):
+        return len(self.t1) + len(self.t2)
+
+
+class TwoQueueCache(object):
+    """
+    2Q: new keys enter a small FIFO (A1in). Keys evicted from it are remembered in a
+    ghost queue (A1out), and only keys requested again while remembered are promoted
+    to the main LRU (Am), so a scan only churns the FIFO.
+    """
+
+    def __init__(self, capacity, in_ratio=0.25, out_ratio=0.5):
+        self.capacity = capacity
+        self.in_capacity = max(1, int(capacity * in_ratio))
+        self.out_capacity = max(1, int(capacity * out_ratio))
+        self.a1_in = OrderedDict()
+        self.a1_out = OrderedDict()
+        self.am = OrderedDict()
+
+    def get(self, key):
+        if not is_valid_key(key):
+            return -1
+        if key in self.am:
+            self.am.move_to_end(key)
+            return self.am[key]
+        if key in self.a1_in:
+            return self.a1_in[key]
+        return -1
+
+    def set(self, key, value):
+        if not is_valid_key(key):
+            print("Invalid key. Key cannot be None or an empty string.")
+            return
+        if self.capacity <= 0:
+            return
+        if key in self.am:
+            self.am[key] = value
+            self.am.move_to_end(key)
+            return
+        if key in self.a1_in:
+            self.a1_in[key] = value
+            return
+
+        self._reclaim()
+        if key in self.a1_out:
+            del self.a1_out[key]
+            self.am[key] = value
+        else:
+            self.a1_in[key] = value
+
+    def _reclaim(self):
+        if len(self.a1_in) + len(self.am) < self.capacity:
+            return
+        if len(self.a1_in) > self.in_capacity or not self.am:
+            evicted_key, _ = self.a1_in.popitem(last=False)
+            self.a1_out[evicted_key] = None
+            if len(self.a1_out) > self.out_capacity:
+                self.a1_out.popitem(last=False)
+        else:
+            self.am.popitem(last=False)
+
+    def __len__(self):
+        return len(self.a1_in) + len(self.am)
+
+
+POLICIES = {
+    "lru": LRU_Cache,
+    "w-tinylfu": WTinyLFUCache,
+    "arc": ARCCache,
+    "2q": TwoQueueCache,
+}
+
+
+def replay(keys, cache):
+    """
+    Replays a key trace against a cache: every key is looked up, and set on a miss.
+
+    Returns:
+       the hit ratio.
+    """
+    hits = 0
+    requests = 0
+    for key in keys:
+        requests += 1
+        if cache.get(key) != -1:
+            hits += 1
+        else:
+            cache.set(key, key)
+    return hits / requests if requests else 0.0
+
+
+def read_trace(path):
+    """Reads a recorded key trace, one key per line."""
+    with open(path, 'r') as f:
+        return [line.rstrip("\n") for line in f if line.strip()]
+
+
+def synthetic_trace(length=200000, key_space=10000, scan_length=20000, seed=0):
+    """A skewed daytime workload interrupted by one sequential scan over cold keys."""
+    rng = random.Random(seed)
+    keys = [f"hot-{int(key_space * rng.random() ** 3)}" for _ in range(length)]
+    middle = length // 2
+    return keys[:middle] + [f"cold-{index}" for index in range(scan_length)] + keys[middle:]
+
+
+def compare_policies(keys, capacity, policies=POLICIES):
+    """Returns a dict mapping each policy name to its hit ratio on the trace."""
+    return {name: replay(keys, policy(capacity)) for name, policy in policies.items()}
+
+
+def test_cache_policies():
+    for name, policy in POLICIES.items():
+        # Test Case 1: Basic Functionality Testing, same contract as LRU_Cache
+        cache = policy(2)
+        cache.set(1, 1)
+        print(name, cache.get(1), cache.get(3))
+        # Expected Output: <name> 1 -1
+
+    # Test Case 2: Edge Cases with Null and Empty keys
+    cache = ARCCache(2)
+    cache.set(None, 'value_for_none')
+    print(cache.get(None), cache.get(''))
+    # Expected Output: -1 -1
+
+    # Test Case 3: Capacity is never exceeded
+    for name, policy in POLICIES.items():
+        cache = policy(10)
+        for key in range(1000):
+            cache.set(key % 37, key)
+            cache.get(key % 11)
+        size = len(cache.cache) if name == "lru" else len(cache)
+        print(name, size <= 10)
+        # Expected Output: <name> True
+
+    # Test Case 4: A scan over cold keys hurts the scan-resistant policies less than LRU
+    ratios = compare_policies(synthetic_trace(length=40000, key_space=2000, scan_length=5000), 200)
+    print(all(ratios[name] >= ratios["lru"] for name in ("w-tinylfu", "arc", "2q")))
+    # Expected Output: True
+
+    print("All test cases have generated expected output")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a key trace against every cache policy.")
+    parser.add_argument("trace", nargs="?", default=None, help="file with one key per line, synthetic if omitted")
+    parser.add_argument("--capacity", type=int, default=1000)
+    parser.add_argument("--test", action="store_true", help="run the test cases instead")
+    args = parser.parse_args()
+
+    if args.test:
+        test_cache_policies()
+        return
+    keys = read_trace(args.trace) if args.trace else synthetic_trace()
+    print(f"{len(keys)} requests, capacity {args.capacity}")
+    for name, ratio in compare_policies(keys, args.capacity).items():
+        print(f"{name:<10} hit ratio {ratio:.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+import threading
+import time
+
+from problem_1 import LRU_Cache
+
+HISTOGRAM_BUCKETS = 64
+
+
+class LatencyHistogram(object):
+    """
+    Power-of-two latency histogram: bucket i counts the samples of [2^(i-1), 2^i) nanoseconds.
+    Recording a sample is one bit_length and one list increment.
+    """
+
+    def __init__(self):
+        self.buckets = [0] * HISTOGRAM_BUCKETS
+        self.count = 0
+
+    def record(self, nanoseconds):
+        self.buckets[min(nanoseconds.bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+        self.count += 1
+
+    def percentile(self, fraction):
+        """Returns an upper bound, in nanoseconds, of the given percentile (0 < fraction <= 1)."""
+        if not self.count:
+            return 0
+        threshold = fraction * self.count
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= threshold:
+                return 1 << index
+        return 1 << (HISTOGRAM_BUCKETS - 1)
+
+
+class CacheStats(object):
+    """
+    Counters and latency histograms of an LRU_Cache, attached with LRU_Cache(..., stats=CacheStats()).
+    """
+
+    def __init__(self):
+        self.cache = None
+        self.hits = 0
+        self.misses = 0
+        self.inserts = 0
+        self.updates = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.get_latency = LatencyHistogram()
+        self.set_latency = LatencyHistogram()
+        self._export_thread = None
+        self._export_stop = None
+
+    def record_get(self, hit, nanoseconds):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        self.get_latency.record(nanoseconds)
+
+    def record_set(self, updated, nanoseconds):
+        if updated:
+            self.updates += 1
+        else:
+            self.inserts += 1
+        self.set_latency.record(nanoseconds)
+
+    @property
+    def hit_ratio(self):
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+    def snapshot(self):
+        """Returns the current counters as a plain dict."""
+        cache = self.cache
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hit_ratio,
+            "inserts": self.inserts,
+            "updates": self.updates,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "entries": len(cache.cache) if cache is not None else 0,
+            "size": (cache.current_size if cache.sizer is not None else len(cache.cache)) if cache is not None else 0,
+            "capacity": cache.capacity if cache is not None else 0,
+            "get_p50_ns": self.get_latency.percentile(0.5),
+            "get_p99_ns": self.get_latency.percentile(0.99),
+            "set_p50_ns": self.set_latency.percentile(0.5),
+            "set_p99_ns": self.set_latency.percentile(0.99),
+        }
+
+    def start_export(self, interval, export):
+        """
+        Calls export(snapshot) every `interval` seconds from a daemon thread, until stop_export.
+        """
+        self.stop_export()
+        stop = threading.Event()
+
+        def loop():
+            while not stop.wait(interval):
+                export(self.snapshot())
+
+        self._export_stop = stop
+        self._export_thread = threading.Thread(target=loop, name="cache-stats-export", daemon=True)
+        self._export_thread.start()
+
+    def stop_export(self):
+        if self._export_thread is not None:
+            self._export_stop.set()
+            self._export_thread.join()
+            self._export_thread = None
+
+
+class _BaselineLRU(LRU_Cache):
+    """LRU_Cache with the original, statistics-free get, the reference of the micro-benchmark."""
+
+    def get(self, key, default=-1):
+        if key is None or key == '':
+            return default
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+        return default
+
+
+def benchmark_get_overhead(operations=1000000, capacity=1000):
+    """
+    Measures get throughput of the original get, and of LRU_Cache with instrumentation disabled and enabled.
+
+    Returns:
+       (baseline ops/s, disabled ops/s, enabled ops/s)
+    """
+    rates = []
+    for cache in (_BaselineLRU(capacity), LRU_Cache(capacity), LRU_Cache(capacity, stats=CacheStats())):
+        for key in range(capacity):
+            cache.set(key, key)
+        get = cache.get
+        keys = [index % (2 * capacity) for index in range(operations)]
+        start = time.perf_counter()
+        for key in keys:
+            get(key)
+        rates.append(operations / (time.perf_counter() - start))
+    return tuple(rates)
+
+
+def test_cache_stats():
+    stats = CacheStats()
+    cache = LRU_Cache(2, stats=stats)
+
+    # Test Case 1: Hits, misses, inserts, updates and evictions are counted
+    cache.set(1, 1)
+    cache.set(2, 2)
+    cache.set(2, 3)  # Update
+    cache.get(1)  # Hit
+    cache.get(5)  # Miss
+    cache.set(3, 3)  # Evicts key 2
+    snapshot = stats.snapshot()
+    print(snapshot["hits"], snapshot["misses"], snapshot["inserts"], snapshot["updates"], snapshot["evictions"],
+          snapshot["entries"])
+    # Expected Output: 1 1 3 1 1 2
+
+    # Test Case 2: A cached -1 counts as a hit and is returned as is
+    cache.set(4, -1)
+    print(cache.get(4), stats.hits)
+    # Expected Output: -1 2
+
+    # Test Case 3: Invalid keys are misses and are not counted as inserts
+    cache.set(None, 'value_for_none')
+    print(cache.get(None), stats.misses, stats.inserts)
+    # Expected Output: -1 2 4 (after "Invalid key..." is printed)
+
+    # Test Case 4: Latencies are recorded for every call
+    print(stats.get_latency.count, stats.set_latency.count)
+    # Expected Output: 4 5
+
+    # Test Case 5: Without stats, get is the plain method, with no wrapper in the way
+    print(LRU_Cache(2).get.__func__ is LRU_Cache.get)
+    # Expected Output: True
+
+    # Test Case 6: The export hook is called periodically with a snapshot
+    exported = []
+    stats.start_export(0.01, exported.append)
+    time.sleep(0.1)
+    stats.stop_export()
+    print(len(exported) > 0 and exported[-1]["entries"] == 2)
+    # Expected Output: True
+
+    print("All test cases have generated expected output")
+
+
+if __name__ == "__main__":
+    test_cache_stats()
+    baseline, disabled, enabled = benchmark_get_overhead()
+    print(f"\nget without stats support: {baseline:,.0f} ops/s")
+    print(f"get with stats disabled:  {disabled:,.0f} ops/s")
+    print(f"get with stats enabled:   {enabled:,.0f} ops/s")
@@ -0,0 +1,242 @@
+import argparse
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+
+# A directory modified this recently may change again within the same mtime tick,
+# so its listing is not trusted on the next refresh.
+MTIME_SETTLE_NS = 2 * 10 ** 9
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS directories (path TEXT PRIMARY KEY, mtime INTEGER, subdirectories TEXT);
+CREATE TABLE IF NOT EXISTS files (directory TEXT, path TEXT, extension TEXT);
+CREATE INDEX IF NOT EXISTS files_by_extension ON files (extension, path);
+CREATE INDEX IF NOT EXISTS files_by_directory ON files (directory);
+"""
+
+
+def extension_of(name):
+    """The part of a file name from its last dot, the key of the suffix map ('' without a dot)."""
+    dot = name.rfind('.')
+    return name[dot:] if dot >= 0 else ''
+
+
+def _is_ancestor(identity, level):
+    while level is not None:
+        if level[0] == identity:
+            return True
+        level = level[1]
+    return False
+
+
+class FileIndex(object):
+    """
+    Incremental index of the files beneath a root directory, for repeated find_files queries,
+    stored in a sqlite database so a new process can query it without loading it whole.
+
+    Every directory is stored with its mtime and the names of its subdirectories, and every
+    file with its extension, indexed by (extension, path). A refresh stats each known directory
+    once and only lists again the directories whose mtime changed, which is when entries were
+    added, removed or renamed in them. An extension query then reads the paths of that extension
+    straight from the index, already sorted.
+    """
+
+    def __init__(self, root, path=":memory:"):
+        """
+        Args:
+          root(str): directory to index.
+          path(str): database file of the index, created if needed, in memory by default.
+        """
+        self.root = root
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+            stored = self.connection.execute("SELECT value FROM meta WHERE key = 'root'").fetchone()
+            if stored is None or stored[0] != root:
+                # An index of another root is of no use, start over.
+                self.connection.executescript("DELETE FROM directories; DELETE FROM files; DELETE FROM meta;")
+                self.connection.execute("INSERT INTO meta VALUES ('root', ?)", (root,))
+
+    def refresh(self):
+        """
+        Brings the index up to date with the file system.
+
+        Returns:
+           the number of directories that had to be listed again.
+        """
+        connection = self.connection
+        known = {directory: (mtime, subdirectories) for directory, mtime, subdirectories
+                 in connection.execute("SELECT path, mtime, subdirectories FROM directories")}
+        listed = 0
+        seen = set()
+        with connection:
+            # Each stack item is (directory, parent level), a level being ((device, inode), parent level),
+            # so a directory reached again through a symlink to one of its ancestors is not descended.
+            stack = [(self.root, None)]
+            while stack:
+                directory, parent = stack.pop()
+                try:
+                    stat = os.stat(directory)
+                except OSError:
+                    continue
+                identity = (stat.st_dev, stat.st_ino)
+                if _is_ancestor(identity, parent):
+                    continue  # Symlink loop
+                level = (identity, parent)
+                mtime = stat.st_mtime_ns
+                seen.add(directory)
+                mtime_and_subdirectories = known.get(directory)
+                if mtime_and_subdirectories is None or mtime_and_subdirectories[0] != mtime:
+                    subdirectories = self._list(directory, mtime, mtime_and_subdirectories is not None)
+                    listed += 1
+                else:
+                    subdirectories = mtime_and_subdirectories[1]
+                if subdirectories:
+                    # Names cannot contain '/', so it separates them.
+                    stack.extend((os.path.join(directory, name), level) for name in subdirectories.split('/'))
+
+            for directory in known.keys() - seen:
+                connection.execute("DELETE FROM files WHERE directory = ?", (directory,))
+                connection.execute("DELETE FROM directories WHERE path = ?", (directory,))
+        return listed
+
+    def _list(self, directory, mtime, indexed):
+        """Lists a directory into the index, and returns its subdirectory names joined with '/'."""
+        files, subdirectories = [], []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        subdirectories.append(entry.name)
+                    elif entry.is_file():
+                        files.append((directory, entry.path, extension_of(entry.name)))
+        except OSError:
+            pass
+        if indexed:
+            self.connection.execute("DELETE FROM files WHERE directory = ?", (directory,))
+        self.connection.executemany("INSERT INTO files VALUES (?, ?, ?)", files)
+        if time.time_ns() - mtime < MTIME_SETTLE_NS:
+            mtime = None
+        subdirectories = '/'.join(subdirectories)
+        self.connection.execute("INSERT OR REPLACE INTO directories VALUES (?, ?, ?)",
+                                (directory, mtime, subdirectories))
+        return subdirectories
+
+    def find(self, suffix, refresh=True):
+        """
+        Returns the sorted list of indexed files with the given file name suffix.
+
+        Args:
+          suffix(str): suffix of the file name to be found.
+          refresh(bool): bring the index up to date first.
+        """
+        if refresh:
+            self.refresh()
+        extension = extension_of(suffix)
+        if not suffix:
+            rows = self.connection.execute("SELECT path FROM files ORDER BY path")
+        elif extension and '/' not in extension and os.sep not in extension:
+            # A path ending with the suffix has the extension of the suffix.
+            rows = self.connection.execute("SELECT path FROM files WHERE extension = ? ORDER BY path", (extension,))
+            if extension != suffix:
+                return [path for path, in rows if path.endswith(suffix)]
+        else:
+            rows = self.connection.execute("SELECT path FROM files WHERE substr(path, -?) = ? ORDER BY path",
+                                           (len(suffix), suffix))
+        return [path for path, in rows]
+
+    def directory_count(self):
+        return self.connection.execute("SELECT count(*) FROM directories").fetchone()[0]
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def find_files_indexed(suffix, path, index_path):
+    """
+    find_files backed by a persistent FileIndex stored at `index_path`.
+
+    Returns:
+       a sorted list of paths.
+    """
+    if not os.path.isdir(path):
+        return [path] if os.path.isfile(path) and path.endswith(suffix) else []
+    with FileIndex(path, index_path) as index:
+        return index.find(suffix)
+
+
+def test_file_index():
+    # Test Case 1: Same files as find_files
+    index = FileIndex("./testdir")
+    print(index.find('.c'))
+    # Expected Output: ['./testdir/subdir1/a.c', './testdir/subdir3/subsubdir1/b.c', './testdir/subdir5/a.c', './testdir/t1.c']
+
+    # Test Case 2: Suffixes that are not extensions, and the empty suffix
+    print(index.find('a.h'), len(index.find('')))
+    # Expected Output: ['./testdir/subdir1/a.h', './testdir/subdir5/a.h'] 10
+
+    # Test Case 3: Only changed directories are listed again
+    root = tempfile.mkdtemp()
+    index_path = os.path.join(root, "index.db")
+    tree = os.path.join(root, "tree")
+    try:
+        for directory in ("a", "b", "b/c"):
+            os.makedirs(os.path.join(tree, directory))
+        open(os.path.join(tree, "a", "x.c"), 'w').close()
+        settled = time.time() - 10
+        for directory in (tree, "a", "b", "b/c"):
+            os.utime(os.path.join(tree, directory), (settled, settled))
+        print(find_files_indexed('.c', tree, index_path) == [os.path.join(tree, "a", "x.c")])
+        # Expected Output: True
+
+        index = FileIndex(tree, index_path)
+        open(os.path.join(tree, "b", "c", "y.c"), 'w').close()
+        print(index.refresh(), len(index.find('.c', refresh=False)))
+        # Expected Output: 1 2
+
+        # Test Case 4: Removed directories and files leave the index
+        shutil.rmtree(os.path.join(tree, "b"))
+        print(index.find('.c'), index.directory_count())
+        # Expected Output: ['<root>/tree/a/x.c'] 2
+
+        # Test Case 5: Symlinks back to an ancestor are not descended
+        os.symlink(tree, os.path.join(tree, "a", "loop"))
+        os.symlink(tree, os.path.join(tree, "a", "loop2"))
+        print(len(index.find('.c')))
+        # Expected Output: 1
+        index.close()
+    finally:
+        shutil.rmtree(root)
+
+    print("All test cases have generated expected output")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find files by suffix through a persistent incremental index.")
+    parser.add_argument("suffix", nargs="?", default=None)
+    parser.add_argument("path", nargs="?", default=".")
+    parser.add_argument("--index", default=".file_index.db", help="index file, created on the first query")
+    parser.add_argument("--test", action="store_true", help="run the test cases instead")
+    args = parser.parse_args()
+
+    if args.test or args.suffix is None:
+        test_file_index()
+        return
+    start = time.perf_counter()
+    paths = find_files_indexed(args.suffix, args.path, args.index)
+    for path in paths:
+        print(path)
+    print(f"{len(paths)} files in {time.perf_counter() - start:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+import argparse
+import fnmatch
+import os
+import queue
+import re
+import shutil
+import tempfile
+import threading
+import time
+
+from problem_2 import find_files, find_files_iter
+
+_DONE = object()
+
+
+def make_matcher(suffix=None, globs=(), patterns=()):
+    """
+    Builds a file name test that accepts a name matching any of the given rules.
+
+    Args:
+      suffix: a suffix, or a tuple of suffixes, of the file name.
+      globs: shell-style patterns of the file name, like 'test_*.py'.
+      patterns: regular expressions searched in the file name.
+
+    Returns:
+       a callable name -> bool.
+    """
+    rules = []
+    if suffix is not None:
+        suffixes = (suffix,) if isinstance(suffix, str) else tuple(suffix)
+        rules.append(lambda name: name.endswith(suffixes))
+    if globs:
+        glob_regex = re.compile("|".join(fnmatch.translate(glob) for glob in globs))
+        rules.append(lambda name: glob_regex.match(name) is not None)
+    if patterns:
+        regex = re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+        rules.append(lambda name: regex.search(name) is not None)
+    if len(rules) == 1:
+        return rules[0]
+    return lambda name: any(rule(name) for rule in rules)
+
+
+def _is_ancestor(stat, level):
+    """Tells if the stat'ed directory is `level` or one of its parents, taking their identities lazily."""
+    identity = (stat.st_dev, stat.st_ino)
+    while level is not None:
+        if level[1] is None:
+            level_stat = os.stat(level[0])
+            level[1] = (level_stat.st_dev, level_stat.st_ino)
+        if level[1] == identity:
+            return True
+        level = level[2]
+    return False
+
+
+def find_files_parallel(suffix, path, workers=8, ordered=False, globs=(), patterns=()):
+    """
+    Finds the files beneath the path with a pool of threads listing directories concurrently,
+    which hides the latency of each listing on network and NVMe filesystems.
+
+    Directories go through a shared work queue: a worker lists one, queues its subdirectories
+    and sends the matching files of that directory through a result queue, so results stream
+    out while the walk goes on. Each queued directory is a [path, (device, inode), parent] level,
+    so a symlinked directory is skipped when it is an ancestor on its own path, like in
+    find_files_iter, and symlink loops end.
+
+    Args:
+      suffix: a suffix, or a tuple of suffixes, of the file name, None to only use globs/patterns.
+      path(str): path of the file system.
+      workers(int): number of threads listing directories.
+      ordered(bool): yield the paths sorted, which waits for the whole walk.
+      globs: shell-style patterns of the file name.
+      patterns: regular expressions searched in the file name.
+
+    Returns:
+       a generator of paths.
+    """
+    matches = make_matcher(suffix, globs, patterns)
+    if not os.path.isdir(path):
+        if os.path.isfile(path) and matches(os.path.basename(path)):
+            yield path
+        return
+
+    directories = queue.Queue()
+    results = queue.Queue()
+    stop = threading.Event()
+
+    def worker():
+        while True:
+            level = directories.get()
+            if level is _DONE:
+                return
+            found = []
+            if not stop.is_set():
+                try:
+                    with os.scandir(level[0]) as entries:
+                        for entry in entries:
+                            if entry.is_dir():
+                                if entry.is_symlink():
+                                    try:
+                                        if _is_ancestor(entry.stat(), level):
+                                            continue  # Symlink loop
+                                    except OSError:
+                                        continue  # Dangling or vanished link
+                                directories.put([entry.path, None, level])
+                            elif matches(entry.name) and entry.is_file():
+                                found.append(entry.path)
+                except OSError:
+                    pass  # Unreadable or vanished directory
+            if found:
+                results.put(found)
+            directories.task_done()
+
+    def supervisor():
+        # Every queued directory is marked done only after its subdirectories were queued,
+        # so the queue is drained exactly when the whole tree was listed.
+        directories.join()
+        for _ in threads:
+            directories.put(_DONE)
+        results.put(_DONE)
+
+    directories.put([path, None, None])
+    threads = [threading.Thread(target=worker, name=f"find-files-{index}", daemon=True)
+               for index in range(max(workers, 1))]
+    for thread in threads:
+        thread.start()
+    threading.Thread(target=supervisor, name="find-files-supervisor", daemon=True).start()
+
+    try:
+        if ordered:
+            collected = []
+            for batch in iter(results.get, _DONE):
+                collected.extend(batch)
+            yield from sorted(collected)
+        else:
+            for batch in iter(results.get, _DONE):
+                yield from batch
+    finally:
+        stop.set()
+
+
+def make_tree(root, files, files_per_directory=100, fanout=10, suffixes=('.c', '.h', '.o', '.txt')):
+    """
+    Creates a synthetic source tree of empty files, `fanout` subdirectories per level.
+
+    Returns:
+       the number of files ending with '.c'.
+    """
+    directories = [root]
+    created = 0
+    matching = 0
+    index = 0
+    while created < files:
+        directory = directories[index]
+        index += 1
+        os.makedirs(directory, exist_ok=True)
+        for number in range(min(files_per_directory, files - created)):
+            suffix = suffixes[(created + number) % len(suffixes)]
+            open(os.path.join(directory, f"file{number}{suffix}"), 'w').close()
+            matching += suffix == '.c'
+        created += min(files_per_directory, files - created)
+        directories.extend(os.path.join(directory, f"d{child}") for child in range(fanout))
+    return matching
+
+
+def benchmark_find_files(root, worker_counts=(1, 4, 16, 32)):
+    """
+    Times the recursive, the streaming and the parallel walk over the same tree.
+
+    Returns:
+       a list of (name, seconds, files found).
+    """
+    runs = [("recursive", lambda: find_files('.c', root)),
+            ("scandir", lambda: list(find_files_iter('.c', root)))]
+    runs += [(f"parallel x{workers}", lambda workers=workers: list(find_files_parallel('.c', root, workers)))
+             for workers in worker_counts]
+    results = []
+    for name, run in runs:
+        start = time.perf_counter()
+        found = run()
+        results.append((name, time.perf_counter() - start, len(found)))
+    return results
+
+
+def test_find_files_parallel():
+    # Test Case 1: Same files as find_files, in a deterministic order when asked
+    print(list(find_files_parallel('.c', "./testdir", ordered=True)) == sorted(find_files('.c', "./testdir")))
+    # Expected Output: True
+
+    # Test Case 2: Several suffixes, globs and regular expressions in one traversal
+    print(sorted(os.path.basename(path) for path in find_files_parallel(('.c', '.h'), "./testdir")))
+    print(list(find_files_parallel(None, "./testdir", ordered=True, globs=['t1.*'])))
+    print(list(find_files_parallel(None, "./testdir", ordered=True, patterns=[r'^b\.'])))
+    # Expected Output: ['a.c', 'a.c', 'a.h', 'a.h', 'b.c', 'b.h', 't1.c', 't1.h']
+    # Expected Output: ['./testdir/t1.c', './testdir/t1.h']
+    # Expected Output: ['./testdir/subdir3/subsubdir1/b.c', './testdir/subdir3/subsubdir1/b.h']
+
+    # Test Case 3: Edge Cases with a file path and a non-existent directory
+    print(list(find_files_parallel('.c', "./testdir/t1.c")), list(find_files_parallel('.c', "./non_existent")))
+    # Expected Output: ['./testdir/t1.c'] []
+
+    # Test Case 4: A generated tree is found completely by every worker count
+    root = tempfile.mkdtemp()
+    try:
+        expected = make_tree(root, 2000, files_per_directory=20, fanout=3)
+        print(all(len(list(find_files_parallel('.c', root, workers))) == expected for workers in (1, 3, 16)))
+
+        # Test Case 5: Symlinks back to the root are not followed again
+        os.symlink(root, os.path.join(root, "loop"))
+        os.symlink(root, os.path.join(root, "d0", "loop"))
+        print(len(list(find_files_parallel('.c', root))) == expected)
+    finally:
+        shutil.rmtree(root)
+    # Expected Output: True
+    # Expected Output: True
+
+    print("All test cases have generated expected output")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the recursive and the parallel find_files.")
+    parser.add_argument("--files", type=int, default=1000000, help="files in the synthetic tree")
+    parser.add_argument("--root", default=None, help="existing tree to search instead of a synthetic one")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16, 32])
+    parser.add_argument("--test", action="store_true", help="run the test cases instead")
+    args = parser.parse_args()
+
+    if args.test:
+        test_find_files_parallel()
+        return
+    root = args.root or tempfile.mkdtemp()
+    try:
+        if args.root is None:
+            print(f"Creating {args.files} files in {root}")
+            make_tree(root, args.files)
+        for name, seconds, found in benchmark_find_files(root, args.workers):
+            print(f"{name:<13} {seconds:>8.2f} s  {found} files")
+    finally:
+        if args.root is None:
+            shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,312 @@
+import heapq
+import itertools
+import math
+import os
+import pickle
+import struct
+import sys
+import threading
+import time
 from collections import OrderedDict
 
+_MISS = object()
+SNAPSHOT_MAGIC = b"LRU2"
+SNAPSHOT_SAVED_AT = struct.Struct("<d")
+SNAPSHOT_RECORD = struct.Struct("<I")
+
 
 class LRU_Cache(object):
 
-    def __init__(self, capacity):
+    def __init__(self, capacity, size_aware=False, sizer=sys.getsizeof, ttl=None, clock=time.monotonic,
+                 stats=None):
+        """
+        Args:
+          capacity(int): maximum number of entries, or maximum total size of the values when size_aware.
+          size_aware(bool): count the size of every value against the capacity instead of one per entry.
+          sizer(callable): returns the size of a value in size-aware mode, sys.getsizeof by default.
+          ttl(float): default time to live of the entries in seconds, None for entries that never expire.
+          clock(callable): returns the current time in seconds, time.monotonic by default.
+          stats(CacheStats): collects hit/miss/eviction counters and latencies when given.
+        """
         self.cache = OrderedDict()
         self.capacity = capacity
+        self.sizer = sizer if size_aware else None
+        self.sizes = {}
+        self.current_size = 0
+        self.ttl = ttl
+        self.clock = clock
+        self.expiries = {}
+        # Min-heap of (expires_at, order, key). Entries of overwritten or evicted keys stay in
+        # the heap until they surface or the heap is compacted, so cleanup is amortized.
+        self.expiry_heap = []
+        self._expiry_order = itertools.count()
+        self.stats = stats
+        if stats is not None:
+            # Instance attributes shadow the plain methods, so a cache without stats
+            # runs the uninstrumented get and set with no extra check at all.
+            stats.cache = self
+            self.get = self._instrumented_get
+            self.set = self._instrumented_set
 
-    def get(self, key):
+    def get(self, key, default=-1):
+        """
+        Returns the value of the key, or `default` (-1 unless given) on a miss.
+        Pass a sentinel object as default to tell a miss from a cached -1.
+        """
         if key is None or key == '':
-            return -1
+            return default
+        if self.expiry_heap:
+            self._purge_expired()
         if key in self.cache:
             self.cache.move_to_end(key)
             return self.cache[key]
-        return -1
+        return default
 
-    def set(self, key, value):
+    def set(self, key, value, ttl=None):
+        """
+        Args:
+          key: key of the entry, cannot be None or an empty string.
+          value: value of the entry.
+          ttl(float): time to live of this entry in seconds, the cache default when None,
+            math.inf for an entry that never expires.
+        """
         if key is None or key == '':
             print("Invalid key. Key cannot be None or an empty string.")
             return
 
+        if self.expiry_heap:
+            self._purge_expired()
+        if self.sizer is not None:
+            stored = self._set_sized(key, value)
+        else:
+            stored = self._set_counted(key, value)
+        if stored:
+            self._set_expiry(key, self.ttl if ttl is None else ttl)
+
+    def get_many(self, keys):
+        """
+        Looks up a batch of keys in one pass, with expired entries purged once for the whole batch.
+
+        Returns:
+           (hits, missing): a dict of the cached keys and their values, and the list of the
+           other valid keys, ready to be fetched upstream and filled back with set_many.
+        """
+        if self.expiry_heap:
+            self._purge_expired()
+        cache = self.cache
+        move_to_end = cache.move_to_end
+        hits = {}
+        missing = []
+        for key in keys:
+            if key is None or key == '':
+                continue
+            if key in cache:
+                move_to_end(key)
+                hits[key] = cache[key]
+            else:
+                missing.append(key)
+        if self.stats is not None:
+            self.stats.hits += len(hits)
+            self.stats.misses += len(missing)
+        return hits, missing
+
+    def set_many(self, items, ttl=None):
+        """
+        Sets a batch of entries in one pass.
+
+        Args:
+          items: a dict, or an iterable of (key, value) pairs.
+          ttl(float): time to live of these entries in seconds, the cache default when None.
+        """
+        if hasattr(items, 'items'):
+            items = items.items()
+        if self.expiry_heap:
+            self._purge_expired()
+        store = self._set_sized if self.sizer is not None else self._set_counted
+        ttl = self.ttl if ttl is None else ttl
+        stats = self.stats
+        for key, value in items:
+            if key is None or key == '':
+                print("Invalid key. Key cannot be None or an empty string.")
+                continue
+            existed = stats is not None and key in self.cache
+            if not store(key, value):
+                continue
+            if ttl is not None or self.expiries:
+                self._set_expiry(key, ttl)
+            if stats is not None:
+                if existed:
+                    stats.updates += 1
+                else:
+                    stats.inserts += 1
+
+    def _set_counted(self, key, value):
         if key in self.cache:
             self.cache.move_to_end(key)
             self.cache[key] = value
-            return
+            return True
 
         if len(self.cache) >= self.capacity:
-            self.cache.popitem(last=False)
+            evicted_key, _ = self.cache.popitem(last=False)
+            self._forget(evicted_key)
+            if self.stats is not None:
+                self.stats.evictions += 1
         self.cache[key] = value
+        return True
+
+    def _set_sized(self, key, value):
+        size = self.sizer(value)
+        if size > self.capacity:
+            print("Value too large. Value size exceeds the capacity of the whole cache.")
+            if key in self.cache:
+                # The old value is stale now, so it must not be served any longer.
+                del self.cache[key]
+                self._forget(key)
+            return False
+
+        if key in self.cache:
+            self.current_size -= self.sizes[key]
+            self.cache.move_to_end(key)
+        self.cache[key] = value
+        self.sizes[key] = size
+        self.current_size += size
+
+        while self.current_size > self.capacity:
+            evicted_key, _ = self.cache.popitem(last=False)
+            self._forget(evicted_key)
+            if self.stats is not None:
+                self.stats.evictions += 1
+        return True
+
+    def _set_expiry(self, key, ttl):
+        if ttl is None or ttl == math.inf:
+            self.expiries.pop(key, None)
+            return
+        expires_at = self.clock() + ttl
+        self.expiries[key] = expires_at
+        heapq.heappush(self.expiry_heap, (expires_at, next(self._expiry_order), key))
+        if len(self.expiry_heap) > 2 * len(self.expiries) + 16:
+            self.expiry_heap = [(expires_at, next(self._expiry_order), key)
+                                for key, expires_at in self.expiries.items()]
+            heapq.heapify(self.expiry_heap)
+
+    def _purge_expired(self):
+        now = self.clock()
+        heap = self.expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, _, key = heapq.heappop(heap)
+            if self.expiries.get(key) == expires_at:
+                del self.cache[key]
+                self._forget(key)
+                if self.stats is not None:
+                    self.stats.expirations += 1
+
+    def _instrumented_get(self, key, default=-1):
+        start = time.perf_counter_ns()
+        value = LRU_Cache.get(self, key, _MISS)
+        self.stats.record_get(value is not _MISS, time.perf_counter_ns() - start)
+        return default if value is _MISS else value
+
+    def _instrumented_set(self, key, value, ttl=None):
+        start = time.perf_counter_ns()
+        existed = key in self.cache
+        LRU_Cache.set(self, key, value, ttl)
+        if key in self.cache:
+            self.stats.record_set(existed, time.perf_counter_ns() - start)
+
+    def _forget(self, key):
+        """Drops the size and expiry bookkeeping of a key that left the cache."""
+        if self.sizer is not None:
+            self.current_size -= self.sizes.pop(key)
+        if self.expiries:
+            self.expiries.pop(key, None)
+
+    def _snapshot_entries(self):
+        """
+        Returns the live entries as (key, value, remaining ttl or None), most recently used first.
+        Expired entries are purged first, so they are never written.
+        """
+        if self.expiry_heap:
+            self._purge_expired()
+        if not self.expiries:
+            return [(key, value, None) for key, value in reversed(self.cache.items())]
+        now = self.clock()
+        expiries = self.expiries
+        return [(key, value, expiries[key] - now if key in expiries else None)
+                for key, value in reversed(self.cache.items())]
+
+    def save_snapshot(self, path, entries=None):
+        """
+        Writes the entries to a binary snapshot, most recently used first, so a loader can stop
+        after the entries it has room for. Each entry is a length-prefixed pickle of
+        (key, value, remaining ttl or None). The wall-clock time of the snapshot is saved too,
+        since the cache clock does not survive a restart.
+        """
+        if entries is None:
+            entries = self._snapshot_entries()
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, 'wb') as f:
+            f.write(SNAPSHOT_MAGIC)
+            f.write(SNAPSHOT_SAVED_AT.pack(time.time()))
+            for item in entries:
+                data = pickle.dumps(item, protocol=pickle.HIGHEST_PROTOCOL)
+                f.write(SNAPSHOT_RECORD.pack(len(data)))
+                f.write(data)
+        os.replace(temporary_path, path)
+
+    def save_snapshot_in_background(self, path):
+        """
+        Copies the recency order (references only) and writes the snapshot from a background thread.
+
+        Returns:
+           the writer thread, to join before shutdown.
+        """
+        entries = self._snapshot_entries()
+        writer = threading.Thread(target=self.save_snapshot, args=(path, entries), name="lru-snapshot")
+        writer.start()
+        return writer
+
+    def load_snapshot(self, path):
+        """
+        Streams a snapshot back into the cache, keeping its recency order. Only the most recent
+        entries that fit in the capacity are read, so memory stays bounded by the capacity.
+        Entries keep their remaining time to live, less the time elapsed since the snapshot;
+        the ones that expired meanwhile are skipped, and the ones without expiry never expire.
+
+        Returns:
+           the number of entries restored.
+        """
+        entries = []
+        budget = 0
+        for key, value, ttl in read_snapshot(path):
+            if ttl is not None and ttl <= 0:
+                continue
+            cost = self.sizer(value) if self.sizer is not None else 1
+            if budget + cost > self.capacity:
+                break
+            budget += cost
+            entries.append((key, value, math.inf if ttl is None else ttl))
+        for key, value, ttl in reversed(entries):
+            self.set(key, value, ttl=ttl)
+        return len(entries)
+
+
+def read_snapshot(path):
+    """
+    Lazily yields the (key, value, remaining ttl or None) entries of a snapshot, most recently
+    used first, with the time elapsed since the snapshot was saved already taken off the ttl.
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not an LRU_Cache snapshot.")
+        saved_at, = SNAPSHOT_SAVED_AT.unpack(f.read(SNAPSHOT_SAVED_AT.size))
+        elapsed = max(time.time() - saved_at, 0.0)
+        while True:
+            header = f.read(SNAPSHOT_RECORD.size)
+            if len(header) < SNAPSHOT_RECORD.size:
+                return
+            key, value, ttl = pickle.loads(f.read(SNAPSHOT_RECORD.unpack(header)[0]))
+            yield key, value, None if ttl is None else ttl - elapsed
 
 
 def test_lru_cache():
@@ -63,6 +342,85 @@ def test_lru_cache():
     print(special_cache.get(1))  # Checking if setting a None value is handled
     # Expected Output: None (since we only check for None keys, None values are acceptable)
 
+    # Test Case 4: Size-aware eviction with a byte budget
+    sized_cache = LRU_Cache(100, size_aware=True, sizer=len)
+    sized_cache.set('a', 'x' * 40)
+    sized_cache.set('b', 'x' * 40)
+    sized_cache.get('a')  # 'b' becomes the least recently used key
+    sized_cache.set('c', 'x' * 50)  # Needs 30 more bytes, so 'b' is evicted
+    print(sized_cache.get('b'), sized_cache.current_size)
+    # Expected Output: -1 90
+
+    sized_cache.set('d', 'x' * 101)  # Larger than the whole budget
+    print(sized_cache.get('d'))
+    # Expected Output: -1 (after "Value too large..." is printed)
+
+    sized_cache.set('a', 'x' * 101)  # A rejected update drops the stale value
+    print(sized_cache.get('a'), sized_cache.current_size)
+    # Expected Output: -1 50 (after "Value too large..." is printed)
+
+    # Test Case 5: Entries expire after their time to live
+    now = [0]
+    ttl_cache = LRU_Cache(3, ttl=10, clock=lambda: now[0])
+    ttl_cache.set('default', 1)  # Expires at 10
+    ttl_cache.set('short', 2, ttl=1)  # Expires at 1
+    ttl_cache.set('forever', 3, ttl=math.inf)  # Overrides the default, never expires
+    now[0] = 5
+    print(ttl_cache.get('short'), ttl_cache.get('default'), ttl_cache.get('forever'))
+    # Expected Output: -1 1 3
+
+    # Test Case 6: Expired entries that are never read again are still cleaned up
+    now[0] = 20
+    ttl_cache.set('new', 4)
+    print(len(ttl_cache.cache), len(ttl_cache.expiries))
+    # Expected Output: 2 1 ('forever' and 'new' are left, only 'new' can still expire)
+
+    # Test Case 7: A snapshot restores keys, values and recency order
+    snapshot_path = "lru_cache_test.snapshot"
+    warm_cache = LRU_Cache(3)
+    for key in ('a', 'b', 'c'):
+        warm_cache.set(key, key.upper())
+    warm_cache.get('a')  # Recency order is now b, c, a
+    warm_cache.save_snapshot_in_background(snapshot_path).join()
+    restored_cache = LRU_Cache(3)
+    restored_cache.load_snapshot(snapshot_path)
+    print(list(restored_cache.cache.items()))
+    # Expected Output: [('b', 'B'), ('c', 'C'), ('a', 'A')]
+
+    # Test Case 8: A smaller cache only loads the most recent entries
+    small_cache = LRU_Cache(2)
+    print(small_cache.load_snapshot(snapshot_path), list(small_cache.cache))
+    # Expected Output: 2 ['c', 'a']
+
+    # Test Case 9: Expired entries are not restored, per-entry ttls survive the restart
+    now = [0]
+    expiring_cache = LRU_Cache(3, clock=lambda: now[0])
+    expiring_cache.set('stale', 'old-upstream-value', ttl=1)
+    expiring_cache.set('short', 'value', ttl=150)
+    expiring_cache.set('forever', 'value')
+    now[0] = 100  # 'stale' has expired but was never purged, 'short' has 50 seconds left
+    expiring_cache.save_snapshot(snapshot_path)
+    restarted = [0]
+    restored_cache = LRU_Cache(3, clock=lambda: restarted[0])
+    print(restored_cache.load_snapshot(snapshot_path), restored_cache.get('stale'))
+    restarted[0] = 60
+    print(restored_cache.get('short'), restored_cache.get('forever'))
+    os.remove(snapshot_path)
+    # Expected Output: 2 -1
+    # Expected Output: -1 value
+
+    # Test Case 9: get_many returns hits and misses together, set_many fills the misses back
+    batch_cache = LRU_Cache(3)
+    batch_cache.set_many({1: 'one', 2: 'two'})
+    hits, missing = batch_cache.get_many([2, None, 3, 4])
+    print(hits, missing)
+    # Expected Output: {2: 'two'} [3, 4]
+
+    # Test Case 10: set_many evicts in order, key 1 is the least recently used after get_many
+    batch_cache.set_many([(key, str(key)) for key in missing])
+    print(list(batch_cache.cache))
+    # Expected Output: [2, 3, 4]
+
     print("All test cases have generated expected output")
 
 
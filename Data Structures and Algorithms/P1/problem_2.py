@@ -1,4 +1,10 @@
+import errno
+import fnmatch
 import os
+import re
+import shutil
+import tempfile
+import time
 
 
 def find_files(suffix, path):
@@ -29,6 +35,105 @@ def find_files(suffix, path):
     return files_found
 
 
+def list_directory(path):
+    """
+    Reads the entries of a directory and closes it, so a walk holds no file descriptor per level.
+    Running out of file descriptors is raised, instead of being mistaken for an unreadable directory.
+
+    Returns:
+       a list of os.DirEntry, empty if the directory cannot be read.
+    """
+    try:
+        with os.scandir(path) as entries:
+            return list(entries)
+    except OSError as error:
+        if error.errno in (errno.EMFILE, errno.ENFILE):
+            raise
+        return []  # Unreadable or vanished directory
+
+
+def _is_ancestor(identity, ancestors, identities):
+    for level, known in enumerate(identities):
+        if known is None:
+            stat = os.stat(ancestors[level])
+            known = identities[level] = (stat.st_dev, stat.st_ino)
+        if known == identity:
+            return True
+    return False
+
+
+def find_files_iter(suffix, path, exclude=(), max_depth=None, follow_symlinks=True, min_size=None,
+                    newer_than=None):
+    """
+    Lazily yields the files beneath the path with the given file name suffix, in the same
+    order as find_files. Walks with os.scandir and an explicit stack of directory listings,
+    so file types come from the listing instead of extra stat calls, no recursion limit
+    applies, and memory stays proportional to the depth of the tree times the width of a
+    directory.
+
+    Args:
+      suffix(str): suffix of the file name to be found.
+      path(str): path of the file system.
+      exclude: shell-style patterns, like '.git' or 'node_modules'. Matching directories are
+        pruned without being listed, matching files are skipped.
+      max_depth(int): number of directory levels to descend below the path, None for no limit.
+      follow_symlinks(bool): descend into symlinked directories, except those that are an
+        ancestor on the current path, by (device, inode), so symlink loops end.
+      min_size(int): only yield files of at least this many bytes.
+      newer_than(float): only yield files modified after this timestamp.
+
+    Returns:
+       a generator of paths.
+    """
+    exclude_regex = re.compile("|".join(fnmatch.translate(pattern) for pattern in exclude)) if exclude else None
+
+    def wanted(stat):
+        return ((min_size is None or stat.st_size >= min_size) and
+                (newer_than is None or stat.st_mtime > newer_than))
+
+    if not os.path.isdir(path):
+        if os.path.isfile(path) and path.endswith(suffix) and wanted(os.stat(path)):
+            yield path
+        return
+
+    check_stat = min_size is not None or newer_than is not None
+    stack = [iter(list_directory(path))]
+    # Directory path and (device, inode) of every level of the stack. Identities are only
+    # needed to check a symlinked directory, so they are taken lazily.
+    ancestors = [path]
+    identities = [None]
+    while stack:
+        entry = next(stack[-1], None)
+        if entry is None:
+            stack.pop()
+            ancestors.pop()
+            identities.pop()
+            continue
+        if exclude_regex is not None and exclude_regex.match(entry.name):
+            continue
+        if entry.is_dir(follow_symlinks=follow_symlinks):
+            if max_depth is not None and len(stack) > max_depth:
+                continue
+            if follow_symlinks and entry.is_symlink():
+                try:
+                    stat = entry.stat()
+                    if _is_ancestor((stat.st_dev, stat.st_ino), ancestors, identities):
+                        continue  # Symlink loop
+                except OSError:
+                    continue  # Dangling or vanished link
+            stack.append(iter(list_directory(entry.path)))
+            ancestors.append(entry.path)
+            identities.append(None)
+        elif entry.name.endswith(suffix) and entry.is_file(follow_symlinks=follow_symlinks):
+            if check_stat:
+                try:
+                    if not wanted(entry.stat(follow_symlinks=follow_symlinks)):
+                        continue
+                except OSError:
+                    continue
+            yield entry.path
+
+
 def test_find_files():
     print("=== Test Cases for find_files Function ===\n")
 
@@ -56,6 +161,61 @@ def test_find_files():
     print(result)
     # Expected output: ['./testdir/t1.c']
 
+    # Test Case 5: The generator variant yields the same paths, in the same order
+    print("\nTest Case 5: find_files_iter matches find_files")
+    result = list(find_files_iter('.c', "./testdir"))
+    print(result == find_files('.c', "./testdir"), list(find_files_iter('.c', "./non_existent_directory")))
+    # Expected output: True []
+
+    # Test Case 6: The first match arrives before the walk is over
+    print("\nTest Case 6: find_files_iter is lazy")
+    print(next(find_files_iter('.h', "./testdir"), None) is not None)
+    # Expected output: True
+
+    # Test Case 7: Excluded directories are pruned, and the depth can be limited
+    print("\nTest Case 7: find_files_iter with exclude and max_depth")
+    print(sorted(find_files_iter('.c', "./testdir", exclude=['subdir[13]'])))
+    print(list(find_files_iter('.c', "./testdir", max_depth=0)))
+    # Expected output: ['./testdir/subdir5/a.c', './testdir/t1.c']
+    # Expected output: ['./testdir/t1.c']
+
+    # Test Case 8: Symlink loops end, and size and age filters use the walk's stat data
+    print("\nTest Case 8: find_files_iter with symlink loops, min_size and newer_than")
+    root = tempfile.mkdtemp()
+    try:
+        os.makedirs(os.path.join(root, "a"))
+        with open(os.path.join(root, "a", "big.c"), 'w') as f:
+            f.write("int main(void) { return 0; }\n")
+        open(os.path.join(root, "a", "empty.c"), 'w').close()
+        os.symlink(root, os.path.join(root, "a", "loop"))
+        os.symlink(root, os.path.join(root, "a", "loop2"))
+        print([os.path.basename(path) for path in sorted(find_files_iter('.c', root))])
+        print([os.path.basename(path) for path in find_files_iter('.c', root, min_size=1)],
+              list(find_files_iter('.c', root, newer_than=time.time() + 60)))
+    finally:
+        shutil.rmtree(root)
+    # Expected output: ['big.c', 'empty.c']
+    # Expected output: ['big.c'] []
+
+    # Test Case 9: A tree deeper than the file descriptor limit is walked completely
+    print("\nTest Case 9: find_files_iter on a 400-level tree")
+    root = tempfile.mkdtemp()
+    try:
+        deepest = root
+        for level in range(400):
+            deepest = os.path.join(deepest, "d")
+            os.mkdir(deepest)
+        open(os.path.join(deepest, "deep.c"), 'w').close()
+        print([os.path.basename(path) for path in find_files_iter('.c', root)])
+        os.remove(os.path.join(deepest, "deep.c"))
+    finally:
+        # Removed bottom-up, since shutil.rmtree keeps a descriptor open per level.
+        while deepest != root:
+            os.rmdir(deepest)
+            deepest = os.path.dirname(deepest)
+        os.rmdir(root)
+    # Expected output: ['deep.c']
+
     print("\n=== All Test Cases Executed ===")
 
 
@@ -1,8 +1,14 @@
 import heapq
+import struct
 from collections import Counter
-from typing import List
+from typing import Dict, List, Tuple
 import sys
 
+# Compressed stream header: original length and number of symbols, then a (symbol, code length) byte pair per symbol.
+HEADER = struct.Struct("<QH")
+ENCODE_CHUNK = 1 << 16  # Symbols encoded per chunk, bounding the intermediate bit string
+DECODE_TABLE_BITS = 12  # Codes up to this length are decoded with one table lookup
+
 
 class Node:
     def __init__(self, frequency=0, key=None, left_child=None, right_child=None):
@@ -71,14 +77,11 @@ def compute_key_codes(node: Node, code="", code_dict=None) -> dict:
 
 
 def build_encode_message(text: str, code_dict: dict) -> str:
-    encode = ""
-    for character in text:
-        encode += code_dict[character]
-    return encode
+    return "".join(map(code_dict.__getitem__, text))
 
 
 def decode_huffman_code(text: str, root: Node):
-    output = ""
+    output = []
     current_node = root
     for bit in text:
         if bit == '0':
@@ -86,9 +89,103 @@ def decode_huffman_code(text: str, root: Node):
         elif bit == '1':
             current_node = current_node.get_right_child()
         if current_node.is_leaf():
-            output += current_node.key
+            output.append(current_node.key)
             current_node = root
-    return output
+    return "".join(output)
+
+
+def canonical_codes(code_lengths: Dict[int, int]) -> List[Tuple[int, int, int]]:
+    """
+    Assigns canonical Huffman codes: symbols sorted by (code length, symbol) get consecutive codes,
+    so the code lengths alone are enough to rebuild the codes.
+
+    Returns:
+       a list of (symbol, code length, code) in canonical order.
+    """
+    codes = []
+    code = 0
+    previous_length = 0
+    for symbol, length in sorted(code_lengths.items(), key=lambda item: (item[1], item[0])):
+        code <<= length - previous_length
+        codes.append((symbol, length, code))
+        code += 1
+        previous_length = length
+    return codes
+
+
+def huffman_compress(data: bytes) -> bytes:
+    """
+    Compresses bytes into a bit-packed Huffman stream with a canonical code-length header.
+    Encoding is linear: each chunk is joined from per-byte code strings and packed with int().
+
+    Returns:
+       the compressed bytes.
+    """
+    if not data:
+        return HEADER.pack(0, 0)
+    code_lengths = {symbol: len(code) for symbol, code in
+                    compute_key_codes(build_huffman_tree(build_frequency_heap(data))).items()}
+    codes = canonical_codes(code_lengths)
+    output = bytearray(HEADER.pack(len(data), len(codes)))
+    for symbol, length, _ in codes:
+        output += bytes((symbol, length))
+
+    code_strings = [""] * 256
+    for symbol, length, code in codes:
+        code_strings[symbol] = format(code, f"0{length}b")
+    pending = ""
+    for start in range(0, len(data), ENCODE_CHUNK):
+        bits = pending + "".join(map(code_strings.__getitem__, data[start:start + ENCODE_CHUNK]))
+        whole = len(bits) - len(bits) % 8
+        if whole:
+            output += int(bits[:whole], 2).to_bytes(whole // 8, 'big')
+        pending = bits[whole:]
+    if pending:
+        output += int(pending.ljust(8, '0'), 2).to_bytes(1, 'big')
+    return bytes(output)
+
+
+def huffman_decompress(data: bytes) -> bytes:
+    """
+    Decompresses a stream written by huffman_compress.
+
+    Codes of up to DECODE_TABLE_BITS bits are decoded with one lookup of the next bits in a table;
+    longer, rare codes are resolved with the canonical first-code ranges of each length.
+    """
+    length, symbol_count = HEADER.unpack_from(data)
+    if not length:
+        return b""
+    offset = HEADER.size
+    code_lengths = {data[offset + 2 * index]: data[offset + 2 * index + 1] for index in range(symbol_count)}
+    codes = canonical_codes(code_lengths)
+    table_bits = min(max(code_lengths.values()), DECODE_TABLE_BITS)
+    table = [None] * (1 << table_bits)
+    long_codes = {}
+    for symbol, code_length, code in codes:
+        if code_length <= table_bits:
+            # Every table index starting with the code decodes to its symbol.
+            span = 1 << (table_bits - code_length)
+            first = code * span
+            table[first:first + span] = [(symbol, code_length)] * span
+        else:
+            long_codes[format(code, f"0{code_length}b")] = symbol
+
+    payload = data[offset + 2 * symbol_count:]
+    bits = format(int.from_bytes(payload, 'big'), f"0{8 * len(payload)}b") + "0" * table_bits
+    output = bytearray()
+    position = 0
+    for _ in range(length):
+        entry = table[int(bits[position:position + table_bits], 2)]
+        if entry is not None:
+            output.append(entry[0])
+            position += entry[1]
+            continue
+        code_length = table_bits + 1
+        while bits[position:position + code_length] not in long_codes:
+            code_length += 1
+        output.append(long_codes[bits[position:position + code_length]])
+        position += code_length
+    return bytes(output)
 
 
 def huffman_encoding(data):
@@ -149,6 +246,10 @@ def perform_test(test_input):
     # Data integrity check
     assert test_input == decoded_data, "Mismatch between original and decoded data."
 
+    compressed_data = huffman_compress(test_input.encode())
+    print(f"Packed size: {len(compressed_data)} bytes")
+    assert huffman_decompress(compressed_data) == test_input.encode(), "Mismatch after packed round trip."
+
     # Size efficiency check (Not applicable for very small strings due to overhead)
     if test_input and len(test_input) > 1:
         assert encoded_size <= sys.getsizeof(test_input), "Encoded data is larger than original data."
@@ -0,0 +1,143 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from problem_1 import LRU_Cache
+
+
+class ShardedLRUCache(object):
+    """
+    Thread-safe LRU cache made of N independently locked LRU_Cache shards.
+
+    Keys are hashed to a shard and the capacity is split between the shards, so
+    threads working on different shards never wait for each other's lock. Each shard
+    evicts its own least recently used key, which approximates a global LRU when
+    keys are spread evenly.
+
+    On CPython with the GIL, only one thread runs Python code at a time, so striping
+    removes lock convoys but does not add throughput with more cores. Scaling needs a
+    free-threaded interpreter, or processes sharing a SharedLRUCache (shared_lru_cache).
+    """
+
+    def __init__(self, capacity, shards=16):
+        if shards < 1:
+            raise ValueError("A sharded cache needs at least one shard.")
+        shards = min(shards, max(capacity, 1))
+        base, extra = divmod(capacity, shards)
+        self.capacity = capacity
+        self.shards = [LRU_Cache(base + (1 if index < extra else 0)) for index in range(shards)]
+        self.locks = [threading.Lock() for _ in range(shards)]
+
+    def _shard(self, key):
+        return hash(key) % len(self.shards)
+
+    def get(self, key, default=-1):
+        index = self._shard(key)
+        with self.locks[index]:
+            return self.shards[index].get(key, default)
+
+    def set(self, key, value):
+        index = self._shard(key)
+        with self.locks[index]:
+            self.shards[index].set(key, value)
+
+    def __len__(self):
+        return sum(len(shard.cache) for shard in self.shards)
+
+
+class LockedLRUCache(object):
+    """LRU_Cache behind one global lock, the baseline the sharded cache is measured against."""
+
+    def __init__(self, capacity):
+        self.cache = LRU_Cache(capacity)
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            return self.cache.get(key)
+
+    def set(self, key, value):
+        with self.lock:
+            self.cache.set(key, value)
+
+
+def benchmark_contention(thread_counts=(1, 2, 4, 8), operations=200000, capacity=10000, key_space=20000):
+    """
+    Measures get/set throughput of the globally locked and the sharded cache as threads are added.
+    Under the GIL both stay flat whatever the core count, since the cache work itself is
+    serialized; only a free-threaded build can show the sharded cache scaling.
+
+    Returns:
+       a list of (threads, locked ops/s, sharded ops/s).
+    """
+    def worker(cache, seed, count):
+        key = seed
+        for _ in range(count):
+            key = (key * 1103515245 + 12345) % key_space
+            if cache.get(key) == -1:
+                cache.set(key, key)
+
+    results = []
+    for threads in thread_counts:
+        rates = []
+        for cache in (LockedLRUCache(capacity), ShardedLRUCache(capacity)):
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                futures = [executor.submit(worker, cache, seed, operations // threads) for seed in range(threads)]
+                for future in futures:
+                    future.result()
+            rates.append(operations / (time.perf_counter() - start))
+        results.append((threads, rates[0], rates[1]))
+    return results
+
+
+def test_sharded_lru_cache():
+    # Test Case 1: Basic Functionality Testing
+    cache = ShardedLRUCache(4, shards=2)
+    cache.set(1, 1)
+    cache.set(2, 2)
+    print(cache.get(1))
+    # Expected Output: 1
+
+    # Test Case 2: Capacity is split between the shards
+    cache = ShardedLRUCache(10, shards=4)
+    print([shard.capacity for shard in cache.shards])
+    # Expected Output: [3, 3, 2, 2]
+
+    # Test Case 3: Eviction is per shard, keys 0, 2 and 4 all land on shard 0 of 2
+    cache = ShardedLRUCache(4, shards=2)
+    cache.set(0, 'a')
+    cache.set(2, 'b')
+    cache.set(4, 'c')
+    print(cache.get(0), cache.get(2), cache.get(4))
+    # Expected Output: -1 b c
+
+    # Test Case 4: Edge Cases with Null and Empty keys are rejected like in LRU_Cache
+    cache.set(None, 'value_for_none')
+    print(cache.get(None))
+    # Expected Output: -1
+
+    # Test Case 5: Concurrent gets and sets never corrupt the shards
+    cache = ShardedLRUCache(100, shards=8)
+
+    def hammer(seed):
+        for i in range(10000):
+            cache.set((seed * i) % 500, i)
+            cache.get(i % 500)
+
+    threads = [threading.Thread(target=hammer, args=(seed,)) for seed in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(len(cache) <= 100)
+    # Expected Output: True
+
+    print("All test cases have generated expected output")
+
+
+if __name__ == "__main__":
+    test_sharded_lru_cache()
+    print("\nthreads  global lock ops/s  sharded ops/s")
+    for threads, locked, sharded in benchmark_contention():
+        print(f"{threads:>7}  {locked:>17.0f}  {sharded:>13.0f}")
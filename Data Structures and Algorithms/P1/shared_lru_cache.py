@@ -0,0 +1,367 @@
+import hashlib
+import multiprocessing
+import pickle
+from multiprocessing import shared_memory
+
+EMPTY = -1
+HEADER_FIELDS = ("capacity", "table_size", "key_size", "value_size", "head", "tail", "count", "free_head")
+HEADER_SIZE = 8 * len(HEADER_FIELDS)
+HEAD, TAIL, COUNT, FREE_HEAD = (HEADER_FIELDS.index(field) for field in ("head", "tail", "count", "free_head"))
+
+
+def stable_hash(data):
+    """64-bit hash of bytes that is the same in every process, unlike hash() on strings."""
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little', signed=True)
+
+
+def encode_key(key):
+    """
+    Encodes a key into bytes that are equal exactly when the keys are, as in an LRU_Cache dict:
+    an int, an equal float and an equal bool share the encoding of the int. Only str, bytes,
+    int, float and bool keys are supported, since other types have no such canonical form.
+    """
+    if isinstance(key, str):
+        return b"s" + key.encode('utf-8', 'surrogatepass')
+    if isinstance(key, bytes):
+        return b"b" + key
+    if isinstance(key, float) and key.is_integer():
+        key = int(key)
+    if isinstance(key, int):
+        return b"i" + str(int(key)).encode()
+    if isinstance(key, float):
+        return b"f" + repr(key).encode()
+    raise TypeError(f"SharedLRUCache keys must be str, bytes, int or float, not {type(key).__name__}.")
+
+
+def align(offset):
+    return (offset + 7) & ~7
+
+
+class SharedLRUCache(object):
+    """
+    LRU cache with the LRU_Cache get/set API whose storage lives in one
+    multiprocessing.shared_memory block, so every worker process on a host
+    shares the same warm cache.
+
+    The block holds fixed-size slots: a key and a value area per slot, an
+    open-addressing hash table of slot indexes (linear probing with backward-shift
+    deletion), and an intrusive doubly linked recency list made of prev/next slot
+    indexes. Keys are encoded and values pickled straight into their slots by the
+    calling process, so nothing goes through a manager process; they must fit in
+    key_size and value_size bytes.
+
+    Keys must be str, bytes, int or float (bool counts as int). Keys compare like
+    in LRU_Cache, so 1, 1.0 and True are the same key. Other key types raise a
+    TypeError, because equal objects such as frozensets can serialize differently.
+
+    Create the cache in the parent, then pass it to the workers (as a Process or
+    Pool initializer argument); they attach to the same block and share its lock.
+    """
+
+    def __init__(self, capacity, key_size=64, value_size=256, name=None, lock=None):
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1.")
+        table_size = 1
+        while table_size < 2 * capacity:
+            table_size <<= 1
+        self.lock = lock if lock is not None else multiprocessing.Lock()
+        size = self._layout(capacity, table_size, key_size, value_size)
+        self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        self.owner = True
+        self._map()
+        header = self.header
+        header[0], header[1], header[2], header[3] = capacity, table_size, key_size, value_size
+        header[HEAD] = header[TAIL] = EMPTY
+        header[COUNT] = 0
+        header[FREE_HEAD] = 0
+        for slot in range(capacity):
+            self.next[slot] = slot + 1 if slot + 1 < capacity else EMPTY
+            self.prev[slot] = EMPTY
+        for index in range(table_size):
+            self.table[index] = EMPTY
+
+    def _layout(self, capacity, table_size, key_size, value_size):
+        self.capacity = capacity
+        self.table_size = table_size
+        self.mask = table_size - 1
+        self.key_size = key_size
+        self.value_size = value_size
+        offset = HEADER_SIZE
+        self.hashes_offset = offset
+        offset = align(offset + 8 * capacity)
+        self.prev_offset = offset
+        offset = align(offset + 4 * capacity)
+        self.next_offset = offset
+        offset = align(offset + 4 * capacity)
+        self.lengths_offset = offset  # key length and value length of every slot
+        offset = align(offset + 8 * capacity)
+        self.table_offset = offset
+        offset = align(offset + 4 * table_size)
+        self.keys_offset = offset
+        offset = align(offset + key_size * capacity)
+        self.values_offset = offset
+        return offset + value_size * capacity
+
+    def _map(self):
+        buf = self.shm.buf
+        self.header = buf[:HEADER_SIZE].cast('q')
+        self.hashes = buf[self.hashes_offset:self.hashes_offset + 8 * self.capacity].cast('q')
+        self.prev = buf[self.prev_offset:self.prev_offset + 4 * self.capacity].cast('i')
+        self.next = buf[self.next_offset:self.next_offset + 4 * self.capacity].cast('i')
+        self.lengths = buf[self.lengths_offset:self.lengths_offset + 8 * self.capacity].cast('i')
+        self.table = buf[self.table_offset:self.table_offset + 4 * self.table_size].cast('i')
+        self.buf = buf
+
+    @classmethod
+    def attach(cls, name, lock):
+        """Attaches to a cache created by another process."""
+        cache = cls.__new__(cls)
+        cache.lock = lock
+        try:
+            cache.shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Python < 3.13 registers the block again, which is harmless: workers share the
+            # resource tracker of the process that created the cache, and it tracks a set of names.
+            cache.shm = shared_memory.SharedMemory(name=name)
+        cache.owner = False
+        header = cache.shm.buf[:HEADER_SIZE].cast('q')
+        capacity, table_size, key_size, value_size = header[0], header[1], header[2], header[3]
+        header.release()
+        cache._layout(capacity, table_size, key_size, value_size)
+        cache._map()
+        return cache
+
+    def __getstate__(self):
+        return {"name": self.shm.name, "lock": self.lock}
+
+    def __setstate__(self, state):
+        attached = SharedLRUCache.attach(state["name"], state["lock"])
+        self.__dict__.update(attached.__dict__)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    # Slot storage
+
+    def _key_bytes(self, slot):
+        start = self.keys_offset + slot * self.key_size
+        return bytes(self.buf[start:start + self.lengths[2 * slot]])
+
+    def _value_bytes(self, slot):
+        start = self.values_offset + slot * self.value_size
+        return bytes(self.buf[start:start + self.lengths[2 * slot + 1]])
+
+    def _write_key(self, slot, data):
+        start = self.keys_offset + slot * self.key_size
+        self.buf[start:start + len(data)] = data
+        self.lengths[2 * slot] = len(data)
+
+    def _write_value(self, slot, data):
+        start = self.values_offset + slot * self.value_size
+        self.buf[start:start + len(data)] = data
+        self.lengths[2 * slot + 1] = len(data)
+
+    # Hash table
+
+    def _find(self, data, hashed):
+        """Returns (table position, slot) of a key, or (first empty position, EMPTY)."""
+        table, hashes = self.table, self.hashes
+        position = hashed & self.mask
+        while True:
+            slot = table[position]
+            if slot == EMPTY:
+                return position, EMPTY
+            if hashes[slot] == hashed and self._key_bytes(slot) == data:
+                return position, slot
+            position = (position + 1) & self.mask
+
+    def _position_of(self, slot):
+        position = self.hashes[slot] & self.mask
+        while self.table[position] != slot:
+            position = (position + 1) & self.mask
+        return position
+
+    def _delete_position(self, position):
+        """Removes a table entry, shifting the following entries back so probing never meets a hole."""
+        table, hashes, mask = self.table, self.hashes, self.mask
+        table[position] = EMPTY
+        current = position
+        while True:
+            current = (current + 1) & mask
+            slot = table[current]
+            if slot == EMPTY:
+                return
+            home = hashes[slot] & mask
+            # The entry can stay if its home lies cyclically in (position, current].
+            if position <= current:
+                stays = position < home <= current
+            else:
+                stays = home > position or home <= current
+            if not stays:
+                table[position] = slot
+                table[current] = EMPTY
+                position = current
+
+    # Recency list
+
+    def _unlink(self, slot):
+        header, prev, next_ = self.header, self.prev, self.next
+        before, after = prev[slot], next_[slot]
+        if before != EMPTY:
+            next_[before] = after
+        else:
+            header[HEAD] = after
+        if after != EMPTY:
+            prev[after] = before
+        else:
+            header[TAIL] = before
+
+    def _push_front(self, slot):
+        header, prev, next_ = self.header, self.prev, self.next
+        head = header[HEAD]
+        prev[slot] = EMPTY
+        next_[slot] = head
+        if head != EMPTY:
+            prev[head] = slot
+        else:
+            header[TAIL] = slot
+        header[HEAD] = slot
+
+    # LRU_Cache API
+
+    def get(self, key, default=-1):
+        if key is None or key == '':
+            return default
+        data = encode_key(key)
+        hashed = stable_hash(data)
+        with self.lock:
+            _, slot = self._find(data, hashed)
+            if slot == EMPTY:
+                return default
+            if self.header[HEAD] != slot:
+                self._unlink(slot)
+                self._push_front(slot)
+            value = self._value_bytes(slot)
+        return pickle.loads(value)
+
+    def set(self, key, value):
+        if key is None or key == '':
+            print("Invalid key. Key cannot be None or an empty string.")
+            return
+        key_data = encode_key(key)
+        value_data = pickle.dumps(value)
+        if len(key_data) > self.key_size or len(value_data) > self.value_size:
+            raise ValueError(f"Encoded key and pickled value must fit in {self.key_size} and {self.value_size} bytes.")
+        hashed = stable_hash(key_data)
+        with self.lock:
+            header = self.header
+            position, slot = self._find(key_data, hashed)
+            if slot != EMPTY:
+                self._write_value(slot, value_data)
+                if header[HEAD] != slot:
+                    self._unlink(slot)
+                    self._push_front(slot)
+                return
+
+            if header[COUNT] >= self.capacity:
+                evicted = header[TAIL]
+                self._unlink(evicted)
+                self._delete_position(self._position_of(evicted))
+                self.next[evicted] = header[FREE_HEAD]
+                header[FREE_HEAD] = evicted
+                header[COUNT] -= 1
+                position, _ = self._find(key_data, hashed)
+
+            slot = header[FREE_HEAD]
+            header[FREE_HEAD] = self.next[slot]
+            self.hashes[slot] = hashed
+            self._write_key(slot, key_data)
+            self._write_value(slot, value_data)
+            self.table[position] = slot
+            self._push_front(slot)
+            header[COUNT] += 1
+
+    def __len__(self):
+        return self.header[COUNT]
+
+    def close(self):
+        for view in (self.header, self.hashes, self.prev, self.next, self.lengths, self.table):
+            view.release()
+        self.buf = None
+        self.shm.close()
+
+    def unlink(self):
+        """Frees the shared memory block. Call once, from the process that created the cache."""
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        owner = self.owner
+        self.close()
+        if owner:
+            self.unlink()
+
+
+def _worker_set(cache, keys):
+    for key in keys:
+        cache.set(key, key * 10)
+    cache.close()
+
+
+def test_shared_lru_cache():
+    with SharedLRUCache(3) as cache:
+        # Test Case 1: Basic Functionality Testing
+        cache.set(1, 1)
+        cache.set(2, 2)
+        print(cache.get(1))
+        # Expected Output: 1
+
+        # Test Case 2: The least recently used key is evicted
+        cache.set(3, 3)
+        cache.set(4, 4)  # Evicts key 2, since key 1 was read after it was set
+        print(cache.get(2), cache.get(1), len(cache))
+        # Expected Output: -1 1 3
+
+        # Test Case 3: Edge Cases with Null and Empty keys, and a cached -1
+        cache.set(None, 'value_for_none')
+        cache.set('minus', -1)
+        print(cache.get(None), cache.get('minus', 'missing'))
+        # Expected Output: -1 -1 (after "Invalid key..." is printed)
+
+        # Test Case 4: Keys compare like in LRU_Cache, and unsupported key types are rejected
+        cache.set(1, 'one')
+        print(cache.get(1.0), cache.get(True), cache.get('1'))
+        try:
+            cache.set(frozenset({1, 2}), 'pair')
+        except TypeError as error:
+            print(error)
+        # Expected Output: one one -1
+        # Expected Output: SharedLRUCache keys must be str, bytes, int or float, not frozenset.
+
+    # Test Case 5: Values written by another process are visible to this one
+    with SharedLRUCache(100) as cache:
+        workers = [multiprocessing.Process(target=_worker_set, args=(cache, range(start, start + 20)))
+                   for start in (0, 20)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        print(len(cache), cache.get(5), cache.get(39))
+        # Expected Output: 40 50 390
+
+    # Test Case 6: Heavy churn keeps the table and the recency list consistent
+    with SharedLRUCache(50, key_size=32, value_size=32) as cache:
+        for index in range(5000):
+            cache.set(index % 173, index)
+            cache.get((index * 7) % 173)
+        print(len(cache), cache.get(4999 % 173))
+        # Expected Output: 50 4999
+
+    print("All test cases have generated expected output")
+
+
+if __name__ == "__main__":
+    test_shared_lru_cache()